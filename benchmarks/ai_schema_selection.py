@@ -0,0 +1,86 @@
+"""Prompt size of the schema sent to the model, full vs selected per question.
+
+Runs offline over a fixed question set: no database or model calls. Tokens
+are counted with ``tiktoken`` when installed, otherwise estimated as
+characters / 4. ``legacy`` is the reflected-schema dict the prompt used to
+embed, rebuilt from the same metadata. A question passes when every expected
+table is in the selection.
+
+    python -m benchmarks.ai_schema_selection
+"""
+
+import time
+from src.ai.schema import SchemaDescription
+from src.models import metadata
+
+QUESTIONS = [
+    ("How much did I spend this month?", {"transactions", "budget_transaction"}),
+    ("What is my biggest expense category?", {"transactions", "expenses"}),
+    ("¿Cuánto gasté en comida la semana pasada?", {"transactions"}),
+    ("How much income did I get from my salary?", {"incomes"}),
+    ("¿Cuáles son mis ingresos de este mes?", {"incomes"}),
+    ("How much have I saved towards my goals?", {"savings"}),
+    ("¿Cuánto llevo ahorrado?", {"savings"}),
+    ("How much do I still owe on my loans?", {"debts"}),
+    ("¿Cuánto debo en total de mis deudas?", {"debts"}),
+    ("Which debt has the highest interest rate?", {"debts"}),
+    ("When did I make my last debt payment?", {"debts", "debt_payments"}),
+    ("¿Cuántas cuotas he pagado de mi préstamo?", {"debts", "debt_payments"}),
+    ("Show my budgets for this month", {"budgets"}),
+    ("¿Cuánto me queda del presupuesto?", {"budgets"}),
+    ("Compare my income and expenses with last month", {"user_monthly_totals"}),
+    ("Dame un resumen de mis finanzas del mes", {"user_monthly_totals"}),
+]
+
+
+def token_counter():
+    try:
+        import tiktoken
+    except ImportError:
+        return "chars/4", lambda text: len(text) // 4
+    encoding = tiktoken.encoding_for_model("gpt-4o")
+    return "tiktoken", lambda text: len(encoding.encode(text))
+
+
+def main():
+    counter, count = token_counter()
+    schema = SchemaDescription(metadata)
+    legacy = str(
+        {
+            table.name: {column.name: str(column.type) for column in table.columns}
+            for table in metadata.tables.values()
+        }
+    )
+    full = count(schema.text)
+    print(f"tokens ({counter}): legacy {count(legacy)}, full {full}")
+
+    selected_total, passed = 0, 0
+    for question, expected in QUESTIONS:
+        matched, joins = schema.select(question)
+        tokens = count(schema.for_question(question))
+        selected_total += tokens
+        ok = expected <= set(matched)
+        passed += ok
+        print(
+            f"{'ok  ' if ok else 'MISS'} {tokens:4d} {question!r}: "
+            f"{', '.join(matched)} (+{', '.join(joins) or '-'})"
+        )
+
+    average = selected_total / len(QUESTIONS)
+    print(
+        f"average selected {average:.0f} tokens, "
+        f"{1 - average / full:.0%} less than full, "
+        f"{1 - average / count(legacy):.0%} less than legacy; "
+        f"{passed}/{len(QUESTIONS)} questions cover their tables"
+    )
+
+    started = time.perf_counter()
+    for _ in range(100):
+        for question, _ in QUESTIONS:
+            schema.for_question(question)
+    elapsed = time.perf_counter() - started
+    print(f"selection: {elapsed / (100 * len(QUESTIONS)) * 1e6:.0f} us/question")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Per-request cost of resolving the current user from an access token.
+
+Times local verification (``AuthService.resolve_token``, which skips the
+token cache) against a token signed with SECRET_KEY/ALGORITHM, then a cached
+``AuthService.authenticate``. Pass ``--token`` with a real access token and
+``--remote`` to time the Supabase ``auth.get_user`` round trip as well.
+
+    python -m benchmarks.auth_overhead --requests 10000
+    python -m benchmarks.auth_overhead --remote --token <access token> --requests 50
+"""
+
+import argparse
+import asyncio
+import time
+from jose import jwt
+from src.container import ServiceContainer
+from src.settings import get_settings
+from src.user.dependencies import get_auth_service
+
+
+def local_token() -> str:
+    settings = get_settings()
+    claims = {
+        "sub": "benchmark-auth",
+        "email": "benchmark-auth@x",
+        "role": "authenticated",
+        "exp": int(time.time()) + 3600,
+    }
+    if settings.AUTH_AUDIENCE:
+        claims["aud"] = settings.AUTH_AUDIENCE
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+async def measure(label: str, authenticate, token: str, requests: int):
+    await authenticate(token)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await authenticate(token)
+    elapsed = time.perf_counter() - started
+    print(f"{label}: {elapsed / requests * 1e6:,.0f} us/request over {requests}")
+
+
+async def main(requests: int, token: str, remote: bool):
+    container = ServiceContainer(get_settings())
+    auth_service = get_auth_service(None, container)
+    token = token or local_token()
+    await measure("local", auth_service.resolve_token, token, requests)
+    await measure("cached", auth_service.authenticate, token, requests)
+    if remote:
+        await measure("remote", auth_service.authenticate_remote, token, requests)
+    await container.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--token")
+    parser.add_argument("--remote", action="store_true")
+    args = parser.parse_args()
+    if args.remote and not args.token:
+        parser.error("--remote needs --token")
+    asyncio.run(main(args.requests, args.token, args.remote))
@@ -0,0 +1,156 @@
+"""Per-request cost of /debts: the old whole-table payment aggregate against
+the user-scoped portfolio query.
+
+Point DATABASE_URL at a scratch database; the schema is created if missing and
+``--users`` users with ``--debts`` debts and ``--payments`` payments per debt
+are seeded once. Both queries then run for ``--samples`` random users and
+must agree on every debt's totals. The old query's time grows with the whole
+table; the new one's with the user's debts.
+
+    python -m benchmarks.debt_portfolio --users 100000 --samples 200
+"""
+
+import argparse
+import asyncio
+import datetime
+import random
+import time
+from sqlalchemy import func, insert, select
+import src.models  # noqa: F401
+from src.budget.models import BudgetModel, BudgetTransactionModel
+from src.database import Base, async_engine, engine, open_session
+from src.debt.models import DebtModel, DebtPaymentModel, DebtStatus
+from src.debt.repository import DebtRepository
+from src.transaction.models import TransactionModel
+from src.user.models import UserModel
+
+USER_PREFIX = "benchmark-debts"
+SEED_BATCH = 2_000
+
+
+def legacy_debts_query(user_id: str):
+    payment_count_subq = (
+        select(
+            DebtPaymentModel.debt_id,
+            func.count(DebtPaymentModel.id).label("paid_installments"),
+            func.sum(DebtPaymentModel.amount_paid).label("total_paid"),
+        )
+        .group_by(DebtPaymentModel.debt_id)
+        .subquery()
+    )
+    return (
+        select(
+            DebtModel,
+            func.coalesce(payment_count_subq.c.paid_installments, 0).label(
+                "paid_installments"
+            ),
+            func.coalesce(payment_count_subq.c.total_paid, 0).label("total_paid"),
+        )
+        .outerjoin(payment_count_subq, DebtModel.id == payment_count_subq.c.debt_id)
+        .outerjoin(
+            BudgetTransactionModel,
+            DebtModel.id == BudgetTransactionModel.transaction_id,
+        )
+        .outerjoin(BudgetModel, BudgetTransactionModel.budget_id == BudgetModel.id)
+        .filter(DebtModel.user_id == user_id)
+        .distinct()
+    )
+
+
+def seed(users: int, debts: int, payments: int):
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        existing = connection.scalar(
+            select(func.count())
+            .select_from(UserModel)
+            .filter(UserModel.id.like(f"{USER_PREFIX}-%"))
+        )
+    due_date = datetime.datetime(2025, 1, 1)
+    for offset in range(existing, users, SEED_BATCH):
+        user_rows, debt_rows, transaction_rows, payment_rows = [], [], [], []
+        for user in range(offset, min(offset + SEED_BATCH, users)):
+            user_id = f"{USER_PREFIX}-{user}"
+            user_rows.append({"id": user_id, "email": f"{user_id}@x"})
+            for debt in range(debts):
+                debt_id = f"{user_id}-{debt}"
+                debt_rows.append(
+                    {
+                        "id": debt_id,
+                        "user_id": user_id,
+                        "creditor": "Benchmark",
+                        "amount": 1000 * (debt + 1),
+                        "due_date": due_date,
+                        "status": DebtStatus.PENDING,
+                        "installment_count": 12,
+                        "minimum_payment": 100,
+                        "interest_rate": 5.0 * (debt + 1),
+                    }
+                )
+                for payment in range(payments):
+                    transaction_id = f"{debt_id}-{payment}"
+                    payment_date = due_date + datetime.timedelta(days=30 * payment)
+                    transaction_rows.append(
+                        {
+                            "id": transaction_id,
+                            "category": "Debt Payment",
+                            "kind": "debt_payment",
+                            "created_at": payment_date,
+                        }
+                    )
+                    payment_rows.append(
+                        {
+                            "id": transaction_id,
+                            "debt_id": debt_id,
+                            "transaction_id": transaction_id,
+                            "payment_date": payment_date,
+                            "amount_paid": 100,
+                            "installment_number": payment + 1,
+                            "status": DebtStatus.PAID,
+                            "created_at": payment_date,
+                        }
+                    )
+        with engine.begin() as connection:
+            connection.execute(insert(UserModel), user_rows)
+            connection.execute(insert(DebtModel), debt_rows)
+            connection.execute(insert(TransactionModel), transaction_rows)
+            connection.execute(insert(DebtPaymentModel), payment_rows)
+
+
+def totals(rows) -> dict:
+    return {row[0].id: (row.paid_installments, float(row.total_paid)) for row in rows}
+
+
+async def measure(users: int, samples: int):
+    user_ids = [
+        f"{USER_PREFIX}-{user}" for user in random.sample(range(users), samples)
+    ]
+    timings = {"legacy": 0.0, "portfolio": 0.0}
+    async with open_session() as db:
+        repository = DebtRepository(db)
+        for user_id in user_ids:
+            started = time.perf_counter()
+            legacy = (await db.execute(legacy_debts_query(user_id))).all()
+            timings["legacy"] += time.perf_counter() - started
+
+            started = time.perf_counter()
+            portfolio = await repository.get_debts_by_user_id(user_id)
+            timings["portfolio"] += time.perf_counter() - started
+
+            assert totals(legacy) == totals(portfolio), user_id
+    for name, elapsed in timings.items():
+        print(f"{name}: {elapsed / samples * 1000:.2f} ms/request")
+    print(f"speedup: {timings['legacy'] / timings['portfolio']:.0f}x")
+    if async_engine is not None:
+        # aiosqlite keeps a worker thread per pooled connection alive.
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--debts", type=int, default=3)
+    parser.add_argument("--payments", type=int, default=4)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+    seed(args.users, args.debts, args.payments)
+    asyncio.run(measure(args.users, args.samples))
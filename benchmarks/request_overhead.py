@@ -0,0 +1,88 @@
+"""Per-request construction cost of the auth and transaction services.
+
+Compares building the shared objects on every request (what the dependency
+functions did before the app-scoped container) with resolving them from a
+container built once. Reports time, peak traced memory and how many HTTP
+client pools are created per request; each new pool means new connections,
+so new TLS handshakes, for the first Supabase call it serves.
+
+    python -m benchmarks.request_overhead --requests 200
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+import httpx
+from src.container import ServiceContainer
+from src.settings import get_settings
+from src.transaction.dependencies import get_transaction_service
+from src.user.dependencies import get_auth_service
+from src.user.token import TokenUserCache, TokenVerifier
+
+
+class ClientCounter:
+    def __init__(self):
+        self.created = 0
+        for client_class in (httpx.Client, httpx.AsyncClient):
+            self.wrap(client_class)
+
+    def wrap(self, client_class):
+        init = client_class.__init__
+
+        def counting_init(client, *args, **kwargs):
+            self.created += 1
+            init(client, *args, **kwargs)
+
+        client_class.__init__ = counting_init
+
+
+def request_scoped_container(settings, token_cache) -> ServiceContainer:
+    """Only what the dependency functions used to build per request: the
+    Supabase client and the token verifier. The token cache came with the
+    container, so it is shared here."""
+    container = ServiceContainer.__new__(ServiceContainer)
+    container.settings = settings
+    container.supabase = container.create_supabase_client()
+    container.token_verifier = TokenVerifier(settings)
+    container.token_cache = token_cache
+    return container
+
+
+def build_request_services(container: ServiceContainer):
+    get_auth_service(None, container)
+    get_transaction_service(None)
+
+
+def measure(label: str, container_for_request, requests: int, counter):
+    build_request_services(container_for_request())
+    counter.created = 0
+    tracemalloc.start()
+    started = time.perf_counter()
+    for _ in range(requests):
+        build_request_services(container_for_request())
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label}: {elapsed / requests * 1e6:,.0f} us, "
+        f"{peak / 1024:,.0f} KiB peak traced, "
+        f"{counter.created / requests:.1f} HTTP client pools per request"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    requests = parser.parse_args().requests
+    settings = get_settings()
+    counter = ClientCounter()
+    container = ServiceContainer(settings)
+    measure(
+        "per-request clients",
+        lambda: request_scoped_container(settings, container.token_cache),
+        requests,
+        counter,
+    )
+    measure("app-scoped container", lambda: container, requests, counter)
+    asyncio.run(container.close())
@@ -0,0 +1,116 @@
+"""Time and peak memory of the streaming transaction export.
+
+Point DATABASE_URL at a scratch database; the schema is created if missing and
+``--rows`` transactions are seeded once for a dedicated user. Peak memory is
+measured with tracemalloc while the NDJSON or CSV body is consumed, and should
+stay flat as ``--rows`` grows.
+
+    python -m benchmarks.transaction_export --rows 1000000 --format csv
+"""
+
+import argparse
+import asyncio
+import datetime
+import time
+import tracemalloc
+from sqlalchemy import func, insert, select
+import src.models  # noqa: F401
+from src.budget.models import BudgetModel, BudgetTransactionModel
+from src.config import generate_uuid
+from src.database import Base, engine, open_session
+from src.income.models import IncomeModel
+from src.transaction.dependencies import get_transaction_service
+from src.transaction.models import TransactionModel
+from src.user.models import UserModel
+
+USER_ID = "benchmark-export"
+BUDGET_ID = "benchmark-export-budget"
+SEED_BATCH = 10_000
+
+
+def seeded_rows(connection) -> int:
+    return connection.scalar(
+        select(func.count())
+        .select_from(BudgetTransactionModel)
+        .filter(BudgetTransactionModel.budget_id == BUDGET_ID)
+    )
+
+
+def seed(rows: int):
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        user = connection.scalar(select(UserModel.id).filter(UserModel.id == USER_ID))
+        if user is None:
+            connection.execute(
+                insert(UserModel).values(
+                    id=USER_ID, fullname="Benchmark", email=f"{USER_ID}@x"
+                )
+            )
+            connection.execute(
+                insert(BudgetModel).values(
+                    id=BUDGET_ID, user_id=USER_ID, name="Benchmark", type="Balanced"
+                )
+            )
+        existing = seeded_rows(connection)
+    start = datetime.datetime(2020, 1, 1)
+    for offset in range(existing, rows, SEED_BATCH):
+        transactions, incomes, links = [], [], []
+        for number in range(offset, min(offset + SEED_BATCH, rows)):
+            transaction_id = generate_uuid()
+            created_at = start + datetime.timedelta(minutes=number)
+            transactions.append(
+                {
+                    "id": transaction_id,
+                    "description": f"benchmark {number}",
+                    "category": "Benchmark",
+                    "kind": "income",
+                    "created_at": created_at,
+                }
+            )
+            incomes.append(
+                {
+                    "id": generate_uuid(),
+                    "transaction_id": transaction_id,
+                    "amount": 10,
+                    "created_at": created_at,
+                }
+            )
+            links.append(
+                {
+                    "id": generate_uuid(),
+                    "budget_id": BUDGET_ID,
+                    "transaction_id": transaction_id,
+                    "amount": 10,
+                }
+            )
+        with engine.begin() as connection:
+            connection.execute(insert(TransactionModel), transactions)
+            connection.execute(insert(IncomeModel), incomes)
+            connection.execute(insert(BudgetTransactionModel), links)
+
+
+async def export(format: str):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = lines = 0
+    async with open_session() as db:
+        service = get_transaction_service(db)
+        async for chunk in service.export_transactions(USER_ID, format):
+            size += len(chunk)
+            lines += chunk.count("\n")
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{format}: {lines} lines, {size / 2**20:.1f} MiB in {elapsed:.1f}s "
+        f"({lines / elapsed:,.0f} rows/s), peak traced memory {peak / 2**20:.1f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    args = parser.parse_args()
+    seed(args.rows)
+    asyncio.run(export(args.format))
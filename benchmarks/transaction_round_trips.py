@@ -0,0 +1,82 @@
+"""Round trips and commits per POST /transaction, with and without the unit of work.
+
+Point DATABASE_URL at a scratch database; the schema is created if missing and
+benchmark rows are inserted for a dedicated user.
+
+    python -m benchmarks.transaction_round_trips --requests 50
+"""
+
+import argparse
+import asyncio
+from sqlalchemy import event
+import src.models  # noqa: F401
+from src.database import Base, async_engine, engine, open_session, settings
+from src.transaction.dependencies import get_transaction_service
+from src.transaction.schemas import TransactionCreateSchema
+from src.user.models import UserModel
+
+USER_ID = "benchmark-round-trips"
+
+
+class RoundTripCounter:
+    def __init__(self, bind):
+        self.statements = 0
+        self.commits = 0
+        event.listen(bind, "before_cursor_execute", self.on_execute)
+        event.listen(bind, "commit", self.on_commit)
+
+    def on_execute(self, *args):
+        self.statements += 1
+
+    def on_commit(self, *args):
+        self.commits += 1
+
+    def reset(self):
+        self.statements = 0
+        self.commits = 0
+
+
+async def ensure_user():
+    async with open_session() as db:
+        if await db.get(UserModel, USER_ID) is None:
+            db.add(UserModel(id=USER_ID, fullname="Benchmark", email=f"{USER_ID}@x"))
+            await db.commit()
+
+
+async def post_transactions(requests: int):
+    for number in range(requests):
+        async with open_session() as db:
+            service = get_transaction_service(db)
+            await service.create_transaction_v2(
+                TransactionCreateSchema(
+                    amount=10,
+                    description=f"benchmark {number}",
+                    category="Benchmark",
+                    type="expense" if number % 2 else "income",
+                ),
+                USER_ID,
+            )
+
+
+async def main(requests: int):
+    Base.metadata.create_all(engine)
+    await ensure_user()
+    bind = async_engine.sync_engine if async_engine is not None else engine
+    counter = RoundTripCounter(bind)
+    # Warm-up request so month budgets exist for both runs.
+    await post_transactions(1)
+    for unit_of_work in (False, True):
+        settings.UNIT_OF_WORK = unit_of_work
+        counter.reset()
+        await post_transactions(requests)
+        print(
+            f"unit_of_work={unit_of_work}: "
+            f"{counter.statements / requests:.1f} statements/request, "
+            f"{counter.commits / requests:.1f} commits/request"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    asyncio.run(main(parser.parse_args().requests))
@@ -0,0 +1,44 @@
+"""user monthly totals
+
+Revision ID: 0eed4025d05b
+Revises: 2676f4ff5e67
+Create Date: 2026-10-18 14:00:00.000000
+
+Per-user, per-month running totals read by GET /summary and kept up to date
+by the write services. Fill it for existing data after upgrading with
+``python -m scripts.backfill_monthly_totals``.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0eed4025d05b"
+down_revision: Union[str, None] = "2676f4ff5e67"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TOTALS = ["income", "expense", "saving", "debt", "debt_payment"]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_monthly_totals",
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        *[
+            sa.Column(name, sa.Float(), server_default="0", nullable=False)
+            for name in TOTALS
+        ],
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "month"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_monthly_totals")
@@ -0,0 +1,55 @@
+"""transactions keyset index
+
+Revision ID: 2676f4ff5e67
+Revises: b2e95ebb5a47
+Create Date: 2026-10-18 13:00:00.000000
+
+GET /transactions pages on (created_at, id); the composite index serves the
+row comparison and the ORDER BY, and replaces the created_at-only index.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2676f4ff5e67"
+down_revision: Union[str, None] = "b2e95ebb5a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_created_at_id",
+            "transactions",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_transactions_created_at",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_created_at",
+            "transactions",
+            ["created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_transactions_created_at_id",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,104 @@
+"""debt payment dates
+
+Revision ID: 2f1eeb37df5c
+Revises: c4a19126db9d
+Create Date: 2026-10-18 17:00:00.000000
+
+Stores last payment date, installments paid, next payment date and estimated
+completion date on debts, maintained when a payment is recorded, instead of
+deriving them from every payment on each read. Existing debts are backfilled
+with the same rules as DebtModel.refresh_payment_dates.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2f1eeb37df5c"
+down_revision: Union[str, None] = "c4a19126db9d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PERIOD = """
+    make_interval(days => CASE payment_frequency
+        WHEN 'WEEKLY' THEN 7
+        WHEN 'BIWEEKLY' THEN 15
+        WHEN 'QUARTERLY' THEN 90
+        WHEN 'YEARLY' THEN 365
+        ELSE 30
+    END)
+"""
+
+
+def upgrade() -> None:
+    op.add_column("debts", sa.Column("last_payment_date", sa.DateTime(), nullable=True))
+    op.add_column(
+        "debts",
+        sa.Column(
+            "installments_paid", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+    op.add_column("debts", sa.Column("next_payment_date", sa.DateTime(), nullable=True))
+    op.add_column(
+        "debts", sa.Column("estimated_completion_date", sa.DateTime(), nullable=True)
+    )
+    op.execute(
+        """
+        UPDATE debts
+        SET last_payment_date = payments.last_payment_date,
+            installments_paid = payments.installments_paid
+        FROM (
+            SELECT debt_id,
+                   max(payment_date) AS last_payment_date,
+                   max(installment_number) AS installments_paid
+            FROM debt_payments
+            GROUP BY debt_id
+        ) AS payments
+        WHERE payments.debt_id = debts.id
+        """
+    )
+    op.execute(
+        f"""
+        UPDATE debts
+        SET next_payment_date = CASE
+                WHEN status = 'PAID' THEN NULL
+                WHEN last_payment_date IS NULL THEN due_date
+                WHEN installments_paid >= installment_count THEN NULL
+                ELSE last_payment_date + {PERIOD}
+            END,
+            estimated_completion_date = CASE
+                WHEN status = 'PAID' THEN last_payment_date
+                WHEN installment_count <= 0
+                  OR installments_paid >= installment_count THEN NULL
+                ELSE coalesce(last_payment_date, due_date)
+                     + (installment_count - installments_paid) * {PERIOD}
+            END
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_debts_user_id_next_payment_date",
+            "debts",
+            ["user_id", "next_payment_date"],
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_debts_user_id_next_payment_date",
+            table_name="debts",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("debts", "estimated_completion_date")
+    op.drop_column("debts", "next_payment_date")
+    op.drop_column("debts", "installments_paid")
+    op.drop_column("debts", "last_payment_date")
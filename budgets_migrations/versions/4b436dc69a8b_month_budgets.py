@@ -0,0 +1,91 @@
+"""month budgets
+
+Revision ID: 4b436dc69a8b
+Revises: a0a32fcce35d
+Create Date: 2026-10-18 10:00:00.000000
+
+Adds budgets.month and a partial unique index on (user_id, month, type) so
+month budgets can be provisioned with INSERT ... ON CONFLICT DO NOTHING.
+Duplicate month budgets left by the old count-then-create race are merged
+into the oldest one before the index is built.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4b436dc69a8b"
+down_revision: Union[str, None] = "a0a32fcce35d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DUPLICATES = """
+    WITH ranked AS (
+        SELECT
+            id,
+            first_value(id) OVER (
+                PARTITION BY user_id, month, type ORDER BY created_at, id
+            ) AS keep_id
+        FROM budgets
+        WHERE deleted_at IS NULL AND month IS NOT NULL
+    ),
+    duplicates AS (SELECT id, keep_id FROM ranked WHERE id <> keep_id)
+"""
+
+
+def upgrade() -> None:
+    op.add_column("budgets", sa.Column("month", sa.Date(), nullable=True))
+    op.execute(
+        """
+        UPDATE budgets
+        SET month = date_trunc('month', created_at)::date
+        WHERE month IS NULL AND name LIKE 'Budget for %'
+        """
+    )
+    op.execute(
+        DUPLICATES
+        + """
+        DELETE FROM budget_transaction bt
+        USING duplicates d
+        WHERE bt.budget_id = d.id
+          AND EXISTS (
+              SELECT 1 FROM budget_transaction kept
+              WHERE kept.budget_id = d.keep_id
+                AND kept.transaction_id = bt.transaction_id
+          )
+        """
+    )
+    op.execute(
+        DUPLICATES
+        + """
+        UPDATE budget_transaction bt
+        SET budget_id = d.keep_id
+        FROM duplicates d
+        WHERE bt.budget_id = d.id
+        """
+    )
+    op.execute(
+        DUPLICATES
+        + """
+        UPDATE budgets b
+        SET deleted_at = now()
+        FROM duplicates d
+        WHERE b.id = d.id
+        """
+    )
+    op.create_index(
+        "uq_budgets_user_month_type",
+        "budgets",
+        ["user_id", "month", "type"],
+        unique=True,
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_budgets_user_month_type", table_name="budgets")
+    op.drop_column("budgets", "month")
@@ -0,0 +1,95 @@
+"""transaction owner
+
+Revision ID: 4f431b07c80b
+Revises: 2f1eeb37df5c
+Create Date: 2026-10-18 18:00:00.000000
+
+Stores the owning user on transactions so GET /transactions pages walk an
+index on (user_id, created_at, id) instead of every user's transactions in
+(created_at, id) order, which replaces the global keyset index. Owners are
+backfilled from the budget links; created_at becomes NOT NULL, missing
+values taken from the linked budget.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4f431b07c80b"
+down_revision: Union[str, None] = "2f1eeb37df5c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("transactions", sa.Column("user_id", sa.String(), nullable=True))
+    op.create_foreign_key(
+        "fk_transactions_user_id", "transactions", "users", ["user_id"], ["id"]
+    )
+    op.execute(
+        """
+        UPDATE transactions
+        SET user_id = links.user_id,
+            created_at = coalesce(
+                transactions.created_at,
+                transactions.updated_at,
+                links.budget_created_at
+            )
+        FROM (
+            SELECT DISTINCT ON (budget_transaction.transaction_id)
+                   budget_transaction.transaction_id,
+                   budgets.user_id,
+                   budgets.created_at AS budget_created_at
+            FROM budget_transaction
+            JOIN budgets ON budgets.id = budget_transaction.budget_id
+            ORDER BY budget_transaction.transaction_id, budgets.created_at
+        ) AS links
+        WHERE links.transaction_id = transactions.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE transactions
+        SET created_at = coalesce(updated_at, timestamp '1970-01-01')
+        WHERE created_at IS NULL
+        """
+    )
+    op.alter_column("transactions", "created_at", nullable=False)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_user_id_created_at_id",
+            "transactions",
+            ["user_id", "created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_transactions_created_at_id",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_created_at_id",
+            "transactions",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_transactions_user_id_created_at_id",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.alter_column("transactions", "created_at", nullable=True)
+    op.drop_constraint("fk_transactions_user_id", "transactions", type_="foreignkey")
+    op.drop_column("transactions", "user_id")
@@ -0,0 +1,183 @@
+"""baseline
+
+Revision ID: a0a32fcce35d
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+Schema as it existed before migrations were tracked. Existing databases
+should be stamped with this revision instead of upgrading through it:
+
+    alembic stamp a0a32fcce35d
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a0a32fcce35d"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+debt_status = sa.Enum("PENDING", "PAID", "OVERDUE", name="debtstatus")
+payment_frequency = sa.Enum(
+    "WEEKLY", "BIWEEKLY", "MONTHLY", "QUARTERLY", "YEARLY", name="paymentfrequency"
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("fullname", sa.String(), nullable=True),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("email_verified", sa.DateTime(), nullable=True),
+        sa.Column("image", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "budgets",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True
+        ),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_budgets_id", "budgets", ["id"])
+
+    op.create_table(
+        "transactions",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.Column("category", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_transactions_id", "transactions", ["id"])
+
+    op.create_table(
+        "budget_transaction",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("budget_id", sa.String(), nullable=False),
+        sa.Column("transaction_id", sa.String(), nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["budget_id"], ["budgets.id"]),
+        sa.ForeignKeyConstraint(["transaction_id"], ["transactions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_budget_transaction_id", "budget_transaction", ["id"])
+
+    op.create_table(
+        "debts",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("creditor", sa.String(), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("due_date", sa.DateTime(), nullable=False),
+        sa.Column("status", debt_status, nullable=False),
+        sa.Column("installment_count", sa.Integer(), nullable=False),
+        sa.Column("minimum_payment", sa.Integer(), nullable=False),
+        sa.Column("interest_rate", sa.Float(), server_default="0.0", nullable=False),
+        sa.Column("payment_frequency", payment_frequency, nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_debts_id", "debts", ["id"])
+    op.create_index("ix_debts_user_id", "debts", ["user_id"])
+
+    op.create_table(
+        "debt_payments",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("debt_id", sa.String(), nullable=False),
+        sa.Column("transaction_id", sa.String(), nullable=False),
+        sa.Column("payment_date", sa.DateTime(), nullable=False),
+        sa.Column("amount_paid", sa.Integer(), nullable=False),
+        sa.Column("installment_number", sa.Integer(), nullable=False),
+        sa.Column("status", debt_status, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["debt_id"], ["debts.id"]),
+        sa.ForeignKeyConstraint(["transaction_id"], ["transactions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_debt_payments_id", "debt_payments", ["id"])
+
+    op.create_table(
+        "incomes",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("transaction_id", sa.String(), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("source", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["transaction_id"], ["transactions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_incomes_id", "incomes", ["id"])
+
+    op.create_table(
+        "expenses",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("transaction_id", sa.String(), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("description", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["transaction_id"], ["transactions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_expenses_id", "expenses", ["id"])
+
+    op.create_table(
+        "savings",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("transaction_id", sa.String(), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("goal", sa.String(), nullable=False),
+        sa.Column("target_date", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["transaction_id"], ["transactions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_savings_id", "savings", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("savings")
+    op.drop_table("expenses")
+    op.drop_table("incomes")
+    op.drop_table("debt_payments")
+    op.drop_table("debts")
+    op.drop_table("budget_transaction")
+    op.drop_table("transactions")
+    op.drop_table("budgets")
+    op.drop_table("users")
+    payment_frequency.drop(op.get_bind(), checkfirst=True)
+    debt_status.drop(op.get_bind(), checkfirst=True)
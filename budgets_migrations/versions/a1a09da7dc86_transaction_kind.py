@@ -0,0 +1,63 @@
+"""transaction kind
+
+Revision ID: a1a09da7dc86
+Revises: 0eed4025d05b
+Create Date: 2026-10-18 15:00:00.000000
+
+Stores the transaction kind (income, expense, saving or debt_payment) on
+transactions so listings and budget totals no longer classify rows through
+outer joins to every child table. Existing rows are backfilled from the child
+tables; rows with no child keep a NULL kind.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a1a09da7dc86"
+down_revision: Union[str, None] = "0eed4025d05b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+KIND_TABLES = [
+    ("income", "incomes"),
+    ("expense", "expenses"),
+    ("saving", "savings"),
+    ("debt_payment", "debt_payments"),
+]
+
+
+def upgrade() -> None:
+    op.add_column("transactions", sa.Column("kind", sa.String(), nullable=True))
+    for kind, table in KIND_TABLES:
+        op.execute(
+            f"""
+            UPDATE transactions SET kind = '{kind}'
+            FROM {table}
+            WHERE {table}.transaction_id = transactions.id
+              AND transactions.kind IS NULL
+            """
+        )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_kind_created_at",
+            "transactions",
+            ["kind", "created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_transactions_kind_created_at",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("transactions", "kind")
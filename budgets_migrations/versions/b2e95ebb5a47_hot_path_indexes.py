@@ -0,0 +1,80 @@
+"""hot path indexes
+
+Revision ID: b2e95ebb5a47
+Revises: 4b436dc69a8b
+Create Date: 2026-10-18 12:00:00.000000
+
+Indexes for the queries behind /transactions, /summary, /budgets and the debt
+endpoints: every foreign key used as a join key, the budget lookups by user,
+and transactions.created_at for ordering. Only the budgets (user_id,
+created_at) index is partial on deleted_at IS NULL, matching the summary
+query's filter; the join-key indexes are full because those joins do not
+filter on deleted_at.
+
+Indexes are built CONCURRENTLY outside the migration transaction so the tables
+stay writable while they build. A failed concurrent build leaves an INVALID
+index behind; drop it and run the upgrade again.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b2e95ebb5a47"
+down_revision: Union[str, None] = "4b436dc69a8b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("deleted_at IS NULL")
+
+INDEXES = [
+    ("ix_budget_transaction_budget_id", "budget_transaction", ["budget_id"], None),
+    (
+        "ix_budget_transaction_transaction_id",
+        "budget_transaction",
+        ["transaction_id"],
+        None,
+    ),
+    ("ix_budgets_user_id_type", "budgets", ["user_id", "type"], None),
+    (
+        "ix_budgets_user_id_created_at_active",
+        "budgets",
+        ["user_id", "created_at"],
+        ACTIVE,
+    ),
+    ("ix_transactions_created_at", "transactions", ["created_at"], None),
+    ("ix_incomes_transaction_id", "incomes", ["transaction_id"], None),
+    ("ix_expenses_transaction_id", "expenses", ["transaction_id"], None),
+    ("ix_savings_transaction_id", "savings", ["transaction_id"], None),
+    ("ix_debt_payments_debt_id", "debt_payments", ["debt_id"], None),
+    ("ix_debt_payments_transaction_id", "debt_payments", ["transaction_id"], None),
+    ("ix_debts_user_id_status", "debts", ["user_id", "status"], None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                postgresql_where=where,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,33 @@
+"""user data version
+
+Revision ID: c4a19126db9d
+Revises: a1a09da7dc86
+Create Date: 2026-10-18 16:00:00.000000
+
+Per-user counter bumped on every committed write; list endpoints use it as
+their ETag.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a19126db9d"
+down_revision: Union[str, None] = "a1a09da7dc86"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("data_version", sa.BigInteger(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "data_version")
@@ -0,0 +1,31 @@
+"""Rebuild user_monthly_totals from incomes, expenses, savings, debts and
+debt payments.
+
+Replaces the stored totals in one transaction, for every user or just one.
+Safe to re-run on PostgreSQL, where concurrent writes to the totals wait for
+it; on other databases run it with writes stopped. Run it once after the
+migration that creates the table.
+
+    python -m scripts.backfill_monthly_totals [--user-id <user id>]
+"""
+
+import argparse
+import asyncio
+from src.database import open_session
+from src.summary.repository import SummaryRepository
+
+
+async def backfill(user_id: str = None):
+    async with open_session() as db:
+        rows = await SummaryRepository(db).rebuild_totals(user_id)
+    print(f"wrote {rows} monthly total rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user-id")
+    asyncio.run(backfill(parser.parse_args().user_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Check that the hot read queries are served by indexes.
+
+Runs EXPLAIN on the statements behind /transactions, /summary, /budgets and
+/debts/due-soon against DATABASE_URL with sequential scans disabled, and exits
+non-zero when a plan still scans one of the hot tables sequentially (i.e. no
+usable index).
+
+    python -m scripts.check_query_plans --user-id <user id>
+"""
+
+import argparse
+import datetime
+import sys
+from sqlalchemy import text
+from src.budget.repository import BudgetRepository
+from src.config import current_month
+from src.database import engine
+from src.debt.repository import DebtRepository
+from src.summary.repository import SummaryRepository
+from src.transaction.repository import TransactionRepository
+
+HOT_TABLES = {
+    "budgets",
+    "budget_transaction",
+    "transactions",
+    "incomes",
+    "expenses",
+    "savings",
+    "debts",
+    "debt_payments",
+    "user_monthly_totals",
+}
+
+
+def hot_queries(user_id: str) -> dict:
+    month = current_month()
+    previous = (month - datetime.timedelta(days=1)).replace(day=1)
+    return {
+        "transactions": TransactionRepository(None)
+        .transactions_query(user_id)
+        .limit(51),
+        "summary": SummaryRepository(None).months_query(user_id, [month, previous]),
+        "budgets": BudgetRepository(None).budget_summary_query(user_id),
+        "debts due soon": DebtRepository(None).due_before_query(
+            user_id, datetime.datetime.now() + datetime.timedelta(days=7)
+        ),
+    }
+
+
+def plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def sequential_scans(plan: dict) -> list[str]:
+    return sorted(
+        {
+            node["Relation Name"]
+            for node in plan_nodes(plan["Plan"])
+            if node["Node Type"] == "Seq Scan" and node["Relation Name"] in HOT_TABLES
+        }
+    )
+
+
+def check(user_id: str) -> bool:
+    ok = True
+    with engine.connect() as connection:
+        connection.execute(text("SET enable_seqscan = off"))
+        for name, query in hot_queries(user_id).items():
+            compiled = query.compile(dialect=engine.dialect)
+            result = connection.exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + compiled.string, compiled.params
+            )
+            scans = sequential_scans(result.scalar()[0])
+            if scans:
+                ok = False
+                print(f"FAIL {name}: sequential scan on {', '.join(scans)}")
+            else:
+                print(f"ok   {name}")
+        connection.rollback()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user-id", required=True)
+    args = parser.parse_args()
+    sys.exit(0 if check(args.user_id) else 1)
+
+
+if __name__ == "__main__":
+    main()
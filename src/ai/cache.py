@@ -0,0 +1,90 @@
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from src.cache import CacheStats
+
+
+def normalize_question(question: str) -> str:
+    """Fold case, Unicode forms, spacing and trailing punctuation so questions
+    that only differ in formatting share an entry."""
+    question = unicodedata.normalize("NFKC", question).casefold()
+    question = re.sub(r"\s+", " ", question).strip()
+    return question.rstrip("?!. ¿¡")
+
+
+def rows_digest(rows: list[dict[str, Any]]) -> str:
+    payload = json.dumps(rows, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LRUCache:
+    """Bounded LRU; entries optionally expire ``ttl`` seconds after being
+    stored. ``get`` returns ``None`` on a miss, so ``None`` is never stored."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries: OrderedDict[Hashable, tuple] = OrderedDict()
+        self.stats = CacheStats()
+
+    def get(self, key: Hashable):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: Hashable, value) -> None:
+        if value is None:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self.entries[key] = (expires_at, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def snapshot(self) -> dict:
+        return {
+            **self.stats.snapshot(),
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+        }
+
+
+class AIQueryCache:
+    """The three steps of a ``/human-query`` answer, cached separately.
+
+    - ``sql``: normalized question to generated SQL. Only depends on the
+      schema, which is fixed per deploy, so entries live as long as the
+      process.
+    - ``rows``: (SQL, user, data version) to result rows. Writes through the
+      API bump the user's version, so rows change with the user's own data;
+      changes the version does not track (other users' rows, writes made
+      outside the API) show up once the entry is evicted.
+    - ``answers``: (normalized question, rows digest) to the model's answer.
+    """
+
+    def __init__(self, sql_size: int, rows_size: int, answer_size: int):
+        self.sql = LRUCache(sql_size)
+        self.rows = LRUCache(rows_size)
+        self.answers = LRUCache(answer_size)
+
+    def snapshot(self) -> dict:
+        return {
+            "sql": self.sql.snapshot(),
+            "rows": self.rows.snapshot(),
+            "answers": self.answers.snapshot(),
+        }
@@ -1,24 +1,81 @@
 import json
 from fastapi import APIRouter
-from .service import AIService
+from fastapi.responses import StreamingResponse
+from openai import OpenAIError
+from .service import AIService, QueryTooExpensive
 from .schemas import PostHumanQueryPayload, PostHumanQueryResponse
-from src.dependencies import db_dependency
+from src.dependencies import container_dependency, db_dependency
+from src.user.dependencies import auth_dependency
 
 AIRouter = APIRouter()
 
 
+def server_sent_event(data, event: str | None = None) -> str:
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data)}\n\n"
+
+
 @AIRouter.post("/human-query")
-async def get_human_query(payload: PostHumanQueryPayload, db: db_dependency):
-    ai_service = AIService(db)
-    sql_query = ai_service.human_query_to_sql(payload.human_query)
+async def get_human_query(
+    payload: PostHumanQueryPayload,
+    current_user: auth_dependency,
+    db: db_dependency,
+    container: container_dependency,
+):
+    ai_service = AIService(db, container)
+    sql_query = await ai_service.get_sql(payload.human_query)
     if not sql_query:
         return {"error": "Falló la generación de la consulta SQL"}
-    result_dict = json.loads(sql_query)
 
-    result = await ai_service.query(result_dict["sql_query"])
+    try:
+        result = await ai_service.get_rows(sql_query, current_user.id)
+    except QueryTooExpensive as e:
+        print(e)
+        return {"error": "La consulta es demasiado costosa"}
 
-    answer = await ai_service.build_answer(result, payload.human_query)
+    answer = await ai_service.get_answer(result, payload.human_query)
     if not answer:
         return {"error": "Falló la generación de la respuesta"}
     print(answer)
     return {"answer": answer}
+
+
+@AIRouter.post("/human-query/stream")
+async def stream_human_query(
+    payload: PostHumanQueryPayload,
+    current_user: auth_dependency,
+    db: db_dependency,
+    container: container_dependency,
+):
+    """Same as ``/human-query`` but the answer is sent as Server-Sent Events,
+    one ``data`` event per token and a final ``done`` event."""
+    ai_service = AIService(db, container)
+    sql_query = await ai_service.get_sql(payload.human_query)
+    if not sql_query:
+        return {"error": "Falló la generación de la consulta SQL"}
+
+    # The query runs before streaming starts: the session is closed once the
+    # handler returns.
+    try:
+        result = await ai_service.get_rows(sql_query, current_user.id)
+    except QueryTooExpensive as e:
+        print(e)
+        return {"error": "La consulta es demasiado costosa"}
+
+    async def events():
+        try:
+            async for token in ai_service.stream_answer(result, payload.human_query):
+                yield server_sent_event(token)
+        except OpenAIError as e:
+            print(e)
+            yield server_sent_event(
+                "Falló la generación de la respuesta", event="error"
+            )
+            return
+        yield server_sent_event("", event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,154 @@
+import re
+import unicodedata
+from collections import deque
+from typing import Optional
+from sqlalchemy import MetaData, Table
+
+# Words users write for each table, as accent-free prefixes, besides the
+# table name itself. Questions come in English and Spanish.
+TRANSACTION_KEYWORDS = ["transac", "movimiento", "categor", "spent", "spend", "gast"]
+TABLE_KEYWORDS = {
+    "transactions": TRANSACTION_KEYWORDS,
+    # Transaction amounts live on the link to the budget.
+    "budget_transaction": TRANSACTION_KEYWORDS,
+    "expenses": ["expense", "spent", "spend", "gast", "egreso", "compr"],
+    "incomes": ["income", "earn", "salar", "ingres", "gan", "cobr"],
+    "savings": ["saving", "saved", "ahorr", "goal", "meta"],
+    "debts": ["debt", "loan", "owe", "deud", "debo", "prestamo", "credit", "interes"],
+    "debt_payments": ["payment", "paid", "install", "pago", "pague", "cuota"],
+    "budgets": ["budget", "presupuest"],
+    "user_monthly_totals": ["month", "mes", "total", "summary", "resumen"],
+}
+
+KEY_COLUMNS = {"deleted_at"}
+
+
+def fold(value: str) -> str:
+    value = unicodedata.normalize("NFKD", value.casefold())
+    return "".join(char for char in value if not unicodedata.combining(char))
+
+
+def describe_table(table: Table, keys_only: bool = False) -> str:
+    columns = []
+    for column in table.columns:
+        if keys_only and not (
+            column.primary_key or column.foreign_keys or column.name in KEY_COLUMNS
+        ):
+            continue
+        description = f"{column.name} {column.type}"
+        if column.primary_key:
+            description += " pk"
+        for foreign_key in column.foreign_keys:
+            description += f" -> {foreign_key.target_fullname}"
+        columns.append(description)
+    return f"{table.name}({', '.join(columns)})"
+
+
+class SchemaDescription:
+    """Database schema as prompt text, one ``table(column type, ...)`` line
+    per table.
+
+    Rendered once from the ORM metadata, so building it runs no catalog
+    queries. The metadata only changes with the code, so the description is
+    fixed per deploy: migrations ship with the models and the restart
+    renders it again. ``for_question`` narrows it to the tables a question
+    is about.
+    """
+
+    def __init__(self, metadata: MetaData, root: str = "users"):
+        self.metadata = metadata
+        self.root = root
+        self.rendered: Optional[str] = None
+        self.lines: dict[str, str] = {}
+        self.key_lines: dict[str, str] = {}
+        self.keywords: dict[str, set[str]] = {}
+        self.paths: dict[str, list[str]] = {}
+
+    @property
+    def text(self) -> str:
+        if self.rendered is None:
+            self.render()
+        return self.rendered
+
+    def render(self) -> None:
+        tables = self.metadata.sorted_tables
+        self.lines = {table.name: describe_table(table) for table in tables}
+        self.key_lines = {
+            table.name: describe_table(table, keys_only=True) for table in tables
+        }
+        self.keywords = self.table_keywords(tables)
+        self.paths = self.paths_to_root(tables)
+        self.rendered = "\n".join(self.lines.values())
+
+    def table_keywords(self, tables: list[Table]) -> dict[str, set[str]]:
+        owners: dict[str, set[str]] = {}
+        for table in tables:
+            for column in table.columns:
+                owners.setdefault(column.name, set()).add(table.name)
+        keywords = {}
+        for table in tables:
+            words = {fold(table.name).rstrip("s"), *TABLE_KEYWORDS.get(table.name, [])}
+            # A column name only points at a table when no other table has it.
+            words.update(
+                fold(column.name).split("_")[0]
+                for column in table.columns
+                if owners[column.name] == {table.name}
+                and not column.foreign_keys
+                and len(column.name) >= 5
+            )
+            keywords[table.name] = words
+        return keywords
+
+    def paths_to_root(self, tables: list[Table]) -> dict[str, list[str]]:
+        """Tables joining each table to ``root``, over foreign keys in either
+        direction; this is how a query scopes rows to a user."""
+        neighbours: dict[str, set[str]] = {table.name: set() for table in tables}
+        for table in tables:
+            for foreign_key in table.foreign_keys:
+                target = foreign_key.column.table.name
+                if target in neighbours:
+                    neighbours[table.name].add(target)
+                    neighbours[target].add(table.name)
+        previous = {self.root: None}
+        queue = deque([self.root])
+        while queue:
+            name = queue.popleft()
+            for neighbour in sorted(neighbours.get(name, ())):
+                if neighbour not in previous:
+                    previous[neighbour] = name
+                    queue.append(neighbour)
+        paths = {}
+        for name in neighbours:
+            path, step = [], previous.get(name)
+            while step is not None:
+                path.append(step)
+                step = previous[step]
+            paths[name] = path
+        return paths
+
+    def select(self, question: str) -> tuple[list[str], list[str]]:
+        """Tables the question mentions, and the tables needed to join them
+        to the user."""
+        self.text
+        words = re.findall(r"\w+", fold(question))
+        matched = [
+            name
+            for name, keywords in self.keywords.items()
+            if any(word.startswith(keyword) for word in words for keyword in keywords)
+        ]
+        joins = []
+        for name in matched:
+            for step in self.paths.get(name, []):
+                if step not in matched and step not in joins:
+                    joins.append(step)
+        return matched, joins
+
+    def for_question(self, question: str) -> str:
+        matched, joins = self.select(question)
+        if not matched:
+            return self.text
+        return "\n".join(
+            self.lines[name] if name in matched else self.key_lines[name]
+            for name in self.lines
+            if name in matched or name in joins
+        )
@@ -1,20 +1,72 @@
-import openai
-from typing import Any
+import json
+from typing import Any, AsyncIterator, Optional
 from sqlalchemy import text
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import SQLAlchemyError
-from src.database import get_schema
-from src.settings import get_settings
+from src.container import ServiceContainer
+from src.user.repository import UserRepository
+from .cache import normalize_question, rows_digest
+
+
+class QueryTooExpensive(Exception):
+    pass
 
 
 class AIService:
-    def __init__(self, db):
-        self.settings = get_settings()
-        self.openai = openai.api_key = self.settings.OPENAI_API_KEY
+    def __init__(self, db, container: ServiceContainer):
+        self.settings = container.settings
+        self.openai = container.openai
+        self.model = self.settings.OPENAI_MODEL
         self.db = db
-        self.db_schema = get_schema()
+        self.ai_schema = container.ai_schema
+        self.cache = container.ai_cache
+        self.is_postgres = (
+            make_url(self.settings.DATABASE_URL).get_backend_name() == "postgresql"
+        )
+
+    async def get_sql(self, human_query: str) -> Optional[str]:
+        key = normalize_question(human_query)
+        sql_query = self.cache.sql.get(key)
+        if sql_query is None:
+            response = await self.human_query_to_sql(human_query)
+            if not response:
+                return None
+            sql_query = json.loads(response).get("sql_query")
+            self.cache.sql.set(key, sql_query)
+        return sql_query
+
+    async def get_rows(self, sql_query: str, user_id: str):
+        version = await UserRepository(self.db).get_data_version(user_id)
+        if version is None:
+            return await self.query(sql_query)
+        key = (sql_query, user_id, version)
+        rows = self.cache.rows.get(key)
+        if rows is None:
+            rows = await self.query(sql_query)
+            self.cache.rows.set(key, rows)
+        return rows
+
+    def answer_key(self, result, human_query: str):
+        if result is None:
+            return None
+        return normalize_question(human_query), rows_digest(result)
 
-    def human_query_to_sql(self, human_query: str):
-        database_schema = self.db_schema
+    async def get_answer(self, result, human_query: str) -> str | None:
+        key = self.answer_key(result, human_query)
+        answer = self.cache.answers.get(key) if key else None
+        if answer is None:
+            answer = await self.build_answer(result, human_query)
+            if key:
+                self.cache.answers.set(key, answer)
+        return answer
+
+    def schema_for(self, human_query: str) -> str:
+        if self.settings.AI_SCHEMA_SELECTION:
+            return self.ai_schema.for_question(human_query)
+        return self.ai_schema.text
+
+    async def human_query_to_sql(self, human_query: str):
+        database_schema = self.schema_for(human_query)
         system_message = f"""
             Given the following schema, write a SQL query that retrieves the requested information. 
             Return the SQL query inside a JSON structure with the key "sql_query".
@@ -29,8 +81,8 @@ class AIService:
         """
         user_message = human_query
 
-        response = openai.chat.completions.create(
-            model="gpt-4o",
+        response = await self.openai.chat.completions.create(
+            model=self.model,
             response_format={"type": "json_object"},
             messages=[
                 {"role": "system", "content": system_message},
@@ -40,10 +92,7 @@ class AIService:
 
         return response.choices[0].message.content
 
-    async def build_answer(
-        self, result: list[dict[str, Any]], human_query: str
-    ) -> str | None:
-
+    def answer_messages(self, result: list[dict[str, Any]], human_query: str):
         system_message = f"""
             Given a users question and the SQL rows response from the database from which the user wants to get the answer,
             write a response to the user's question.
@@ -54,23 +103,94 @@ class AIService:
             ${result} 
             </sql_response>
         """
+        if result and len(result) >= self.settings.AI_QUERY_MAX_ROWS:
+            system_message += f"""
+            Only the first {len(result)} rows are shown; the full result may be larger.
+        """
+        return [{"role": "system", "content": system_message}]
 
-        response = openai.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_message},
-            ],
+    async def build_answer(
+        self, result: list[dict[str, Any]], human_query: str
+    ) -> str | None:
+        response = await self.openai.chat.completions.create(
+            model=self.model,
+            messages=self.answer_messages(result, human_query),
         )
 
         return response.choices[0].message.content
 
+    async def stream_answer(
+        self, result: list[dict[str, Any]], human_query: str
+    ) -> AsyncIterator[str]:
+        """Yield the answer as the model writes it, or all at once if cached."""
+        key = self.answer_key(result, human_query)
+        answer = self.cache.answers.get(key) if key else None
+        if answer is not None:
+            yield answer
+            return
+        tokens = []
+        async for token in self.stream_completion(result, human_query):
+            tokens.append(token)
+            yield token
+        if key and tokens:
+            self.cache.answers.set(key, "".join(tokens))
+
+    async def stream_completion(
+        self, result: list[dict[str, Any]], human_query: str
+    ) -> AsyncIterator[str]:
+        stream = await self.openai.chat.completions.create(
+            model=self.model,
+            messages=self.answer_messages(result, human_query),
+            stream=True,
+        )
+        async with stream:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
     async def query(self, sql_query: str):
+        """Run generated SQL under the AI query budget.
+
+        On PostgreSQL the query runs in a read-only transaction with
+        ``AI_QUERY_TIMEOUT_MS`` as statement timeout, and is rejected before
+        running when ``EXPLAIN`` estimates more than ``AI_QUERY_MAX_COST`` or
+        ``AI_QUERY_MAX_PLAN_ROWS``. On every backend at most
+        ``AI_QUERY_MAX_ROWS`` rows are fetched. The transaction is always
+        rolled back.
+        """
         print(sql_query)
         try:
-            result = self.db.execute(text(sql_query))
-            self.db.commit()
-            return [dict(row._mapping) for row in result.fetchall()]
+            if self.is_postgres:
+                await self.db.rollback()
+                await self.db.execute(text("SET TRANSACTION READ ONLY"))
+                await self.db.execute(
+                    text("SELECT set_config('statement_timeout', :timeout, true)"),
+                    {"timeout": str(self.settings.AI_QUERY_TIMEOUT_MS)},
+                )
+                await self.check_plan(sql_query)
+            result = await self.db.stream(text(sql_query))
+            rows = await result.fetchmany(self.settings.AI_QUERY_MAX_ROWS + 1)
+            await result.close()
+            if len(rows) > self.settings.AI_QUERY_MAX_ROWS:
+                print(f"AI query truncated to {self.settings.AI_QUERY_MAX_ROWS} rows")
+                rows = rows[: self.settings.AI_QUERY_MAX_ROWS]
+            return [dict(row._mapping) for row in rows]
         except SQLAlchemyError as e:
-            self.db.rollback()
             print(f"Error executing query: {e}")
             return None
+        finally:
+            await self.db.rollback()
+
+    async def check_plan(self, sql_query: str) -> None:
+        plan = await self.db.scalar(text(f"EXPLAIN (FORMAT JSON) {sql_query}"))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        cost = plan[0]["Plan"]["Total Cost"]
+        rows = plan[0]["Plan"]["Plan Rows"]
+        if (
+            cost > self.settings.AI_QUERY_MAX_COST
+            or rows > self.settings.AI_QUERY_MAX_PLAN_ROWS
+        ):
+            raise QueryTooExpensive(
+                f"Estimated cost {cost:.0f} and {rows} rows exceed the AI query budget"
+            )
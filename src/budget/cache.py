@@ -0,0 +1,36 @@
+import datetime
+from collections import OrderedDict
+
+
+class MonthBudgetCache:
+    """Per-worker LRU of the month budget ids of each user.
+
+    Only ids read back from committed rows are stored, so a rolled back
+    provisioning never leaves ids in the cache.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self.entries: OrderedDict = OrderedDict()
+
+    def get(self, user_id: str, month: datetime.date) -> list[str] | None:
+        key = (user_id, month)
+        budget_ids = self.entries.get(key)
+        if budget_ids is not None:
+            self.entries.move_to_end(key)
+        return budget_ids
+
+    def set(self, user_id: str, month: datetime.date, budget_ids: list[str]) -> None:
+        key = (user_id, month)
+        self.entries[key] = budget_ids
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def discard_budget(self, budget_id: str) -> None:
+        for key, budget_ids in list(self.entries.items()):
+            if budget_id in budget_ids:
+                del self.entries[key]
+
+
+month_budget_cache = MonthBudgetCache()
@@ -1,5 +1,16 @@
 import datetime
-from sqlalchemy import Column, ForeignKey, Float, String, DateTime, event, func
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Float,
+    String,
+    Date,
+    DateTime,
+    Index,
+    event,
+    func,
+    text,
+)
 from sqlalchemy.orm import relationship
 from src.config import generate_uuid
 from src.database import Base
@@ -8,13 +19,31 @@ from src.user.models import UserModel
 
 class BudgetModel(Base):
     __tablename__ = "budgets"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index(
+            "uq_budgets_user_month_type",
+            "user_id",
+            "month",
+            "type",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index("ix_budgets_user_id_type", "user_id", "type"),
+        Index(
+            "ix_budgets_user_id_created_at_active",
+            "user_id",
+            "created_at",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        {"extend_existing": True},
+    )
 
     id = Column(String, primary_key=True, index=True, default=generate_uuid)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
     type = Column(String, nullable=False, default="Balanced")
+    month = Column(Date, nullable=True)
     created_at = Column(DateTime, nullable=True, server_default=func.now())
     updated_at = Column(DateTime, nullable=True)
     deleted_at = Column(DateTime, nullable=True)
@@ -38,8 +67,10 @@ class BudgetTransactionModel(Base):
     __table_args__ = {"extend_existing": True}
 
     id = Column(String, primary_key=True, index=True, default=generate_uuid)
-    budget_id = Column(String, ForeignKey("budgets.id"), nullable=False)
-    transaction_id = Column(String, ForeignKey("transactions.id"), nullable=False)
+    budget_id = Column(String, ForeignKey("budgets.id"), nullable=False, index=True)
+    transaction_id = Column(
+        String, ForeignKey("transactions.id"), nullable=False, index=True
+    )
     amount = Column(Float, nullable=False)
 
     budget = relationship("BudgetModel", back_populates="budget_transaction")
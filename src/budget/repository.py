@@ -1,11 +1,10 @@
 import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import select, case, func
-from sqlalchemy.orm import aliased
-from src.debt.models import DebtPaymentModel, DebtModel
-from src.transaction.models import TransactionModel
-from src.income.models import IncomeModel
-from src.expense.models import ExpenseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, case, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.config import current_month, generate_uuid
+from src.database import persist
+from src.transaction.models import KIND_LABELS, TransactionModel
 from .models import BudgetModel, BudgetTransactionModel
 from .schemas import (
     BudgetCreateSchema,
@@ -16,44 +15,36 @@ from .schemas import (
 
 class BudgetRepository:
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     async def budget_query(self):
-        return self.db.query(BudgetModel).filter(BudgetModel.deleted_at.is_(None))
+        return select(BudgetModel).filter(BudgetModel.deleted_at.is_(None))
 
     async def get_budget(self, budget_id: str):
         query = await self.budget_query()
-        return query.filter(BudgetModel.id == budget_id).first()
-
-    async def get_budget_summary(self, user_id: str):
-        now = datetime.datetime.now()
-        start_of_month = datetime.datetime(now.year, now.month, 1)
-        end_of_month = (
-            datetime.datetime(now.year, now.month + 1, 1)
-            if now.month < 12
-            else datetime.datetime(now.year + 1, 1, 1)
-        )
-        IncomeAlias = aliased(IncomeModel)
-        ExpenseAlias = aliased(ExpenseModel)
-        DebtPaymentAlias = aliased(DebtPaymentModel)
-        DebtAlias = aliased(DebtModel)
-
-        transaction_type_case = case(
-            (IncomeAlias.id != None, "Income"),
-            (ExpenseAlias.id != None, "Expense"),
-            (DebtPaymentAlias.id != None, "DebtPayment"),
-            (DebtAlias.id != None, "Debt"),
-            else_="Other",
-        )
+        result = await self.db.execute(query.filter(BudgetModel.id == budget_id))
+        return result.scalars().first()
+
+    def budget_summary_query(self, user_id: str):
+        def total(kind: str):
+            return func.sum(
+                case(
+                    (TransactionModel.kind == kind, BudgetTransactionModel.amount),
+                    else_=0,
+                )
+            )
 
         subquery = select(BudgetModel.id).filter(
             BudgetModel.user_id == user_id,
-            BudgetModel.created_at.between(start_of_month, end_of_month),
+            # By the month a budget covers: budgets provisioned for past
+            # months (batch imports) are created now.
+            BudgetModel.month == current_month(),
             BudgetModel.type.in_(["Balanced", "Saving", "Debt"]),
+            BudgetModel.deleted_at.is_(None),
         )
 
-        query = (
+        return (
             select(
                 BudgetModel.id,
                 BudgetModel.type,
@@ -61,53 +52,15 @@ class BudgetRepository:
                 BudgetModel.description,
                 BudgetModel.created_at,
                 BudgetModel.updated_at,
-                func.sum(
-                    case(
-                        (
-                            transaction_type_case == "Income",
-                            BudgetTransactionModel.amount,
-                        ),
-                        else_=0,
-                    )
-                ).label("total_income"),
-                func.sum(
-                    case(
-                        (
-                            transaction_type_case == "Expense",
-                            BudgetTransactionModel.amount,
-                        ),
-                        else_=0,
-                    )
-                ).label("total_expense"),
-                func.sum(
-                    case(
-                        (
-                            transaction_type_case == "Saving",
-                            BudgetTransactionModel.amount,
-                        ),
-                        else_=0,
-                    )
-                ).label("total_saving"),
-                func.sum(
-                    case(
-                        (
-                            transaction_type_case == "DebtPayment",
-                            BudgetTransactionModel.amount,
-                        ),
-                        else_=0,
-                    )
-                ).label("total_debt_payment"),
+                total("income").label("total_income"),
+                total("expense").label("total_expense"),
+                total("saving").label("total_saving"),
+                total("debt_payment").label("total_debt_payment"),
             )
-            .outerjoin(
+            .join(
                 TransactionModel,
                 BudgetTransactionModel.transaction_id == TransactionModel.id,
             )
-            .outerjoin(IncomeAlias, TransactionModel.id == IncomeAlias.transaction_id)
-            .outerjoin(ExpenseAlias, TransactionModel.id == ExpenseAlias.transaction_id)
-            .outerjoin(
-                DebtPaymentAlias, TransactionModel.id == DebtPaymentAlias.transaction_id
-            )
-            .outerjoin(DebtAlias, DebtAlias.id == DebtPaymentAlias.debt_id)
             .join(BudgetModel, BudgetTransactionModel.budget_id == BudgetModel.id)
             .filter(BudgetTransactionModel.budget_id.in_(subquery))
             .group_by(
@@ -118,61 +71,35 @@ class BudgetRepository:
                 BudgetModel.description,
             )
         )
-        return self.db.execute(query).fetchall()
 
-    async def get_budget_with_transaction_types(self, budget_id: str):
-        IncomeAlias = aliased(IncomeModel)
-        # InvestmentAlias = aliased(InvestmentModel)
-        # SavingAlias = aliased(SavingModel)
-        DebtPaymentAlias = aliased(DebtPaymentModel)
-        DebtAlias = aliased(DebtModel)
-
-        transaction_type_case = case(
-            (IncomeAlias.id != None, "Ingreso"),
-            # (InvestmentAlias.id != None, "Inversión"),
-            # (SavingAlias.id != None, "Ahorro"),
-            (DebtPaymentAlias.id != None, "Pago de Deuda"),
-            (DebtAlias.id != None, "Deuda"),
-            else_="Otro",
-        )
+    async def get_budget_summary(self, user_id: str):
+        result = await self.db.execute(self.budget_summary_query(user_id))
+        return result.fetchall()
 
-        query = (
+    async def get_budget_with_transaction_types(self, budget_id: str):
+        result = await self.db.execute(
             select(
                 TransactionModel.id,
-                TransactionModel.amount,
+                BudgetTransactionModel.amount,
                 TransactionModel.description,
+                TransactionModel.category,
+                case(KIND_LABELS, value=TransactionModel.kind, else_="Otro").label(
+                    "type"
+                ),
                 TransactionModel.created_at,
-                TransactionModel.budget_id,
-                transaction_type_case.label("category"),
             )
-            .outerjoin(IncomeAlias, TransactionModel.id == IncomeAlias.transaction_id)
-            # .outerjoin(
-            #     InvestmentAlias, TransactionModel.id == InvestmentAlias.transaction_id
-            # )
-            .outerjoin(
-                DebtPaymentAlias, TransactionModel.id == DebtPaymentAlias.transaction_id
+            .join(
+                BudgetTransactionModel,
+                TransactionModel.id == BudgetTransactionModel.transaction_id,
             )
-            .outerjoin(DebtAlias, DebtAlias.id == DebtPaymentAlias.debt_id)
-            .filter(TransactionModel.budget_id == budget_id)
+            .filter(BudgetTransactionModel.budget_id == budget_id)
+            .order_by(TransactionModel.created_at.desc())
         )
-
-        result = self.db.execute(query)
-        transactions = result.fetchall()
-
-        return [
-            TransactionModel(
-                id=transaction.id,
-                amount=transaction.amount,
-                description=transaction.description,
-                created_at=transaction.created_at,
-                budget_id=transaction.budget_id,
-                category=transaction.category,
-            )
-            for transaction in transactions
-        ]
+        return result.all()
 
     async def get_budgets(self):
-        return self.db.query(BudgetModel).all()
+        result = await self.db.execute(select(BudgetModel))
+        return result.scalars().all()
 
     async def create_budget(self, budget: BudgetCreateSchema, user_id: str):
         new_budget = BudgetModel(
@@ -182,8 +109,8 @@ class BudgetRepository:
             description=budget.description,
         )
         self.db.add(new_budget)
-        self.db.commit()
-        self.db.refresh(new_budget)
+        await self.db.commit()
+        await self.db.refresh(new_budget)
         return new_budget
 
     async def create_budget_transanction(self, budget: BudgetTransactionCreateSchema):
@@ -193,45 +120,103 @@ class BudgetRepository:
             amount=budget.amount,
         )
         self.db.add(new_budget_transaction)
-        self.db.commit()
-        self.db.refresh(new_budget_transaction)
+        await persist(self.db, new_budget_transaction)
         return new_budget_transaction
 
-    async def count_budgets_in_date_range(
-        self, start_date: datetime.datetime, end_date: datetime.datetime, user_id: str
+    async def bulk_budget_transactions(
+        self, budget_transactions: list[BudgetTransactionCreateSchema]
     ):
+        if not budget_transactions:
+            return
+        await self.db.execute(
+            insert(BudgetTransactionModel).values(
+                [
+                    {
+                        "budget_id": budget_transaction.budget_id,
+                        "transaction_id": budget_transaction.transaction_id,
+                        "amount": budget_transaction.amount,
+                    }
+                    for budget_transaction in budget_transactions
+                ]
+            )
+        )
+        await persist(self.db)
+
+    async def get_month_budgets(self, user_id: str, month: datetime.date):
         query = await self.budget_query()
-        return query.filter(
-            BudgetModel.user_id == user_id,
-            BudgetModel.created_at.between(start_date, end_date),
-            BudgetModel.type.in_(["Balanced", "Saving", "Debt"]),
-        ).all()
+        result = await self.db.execute(
+            query.filter(BudgetModel.user_id == user_id, BudgetModel.month == month)
+        )
+        return result.scalars().all()
+
+    async def get_month_budget_ids(self, user_id: str, month: datetime.date) -> dict:
+        result = await self.db.execute(
+            select(BudgetModel.type, BudgetModel.id).filter(
+                BudgetModel.user_id == user_id,
+                BudgetModel.month == month,
+                BudgetModel.deleted_at.is_(None),
+            )
+        )
+        return dict(result.all())
+
+    async def get_budget_ids_by_month(
+        self, user_id: str, months: list[datetime.date]
+    ) -> dict:
+        result = await self.db.execute(
+            select(BudgetModel.month, BudgetModel.type, BudgetModel.id).filter(
+                BudgetModel.user_id == user_id,
+                BudgetModel.month.in_(months),
+                BudgetModel.deleted_at.is_(None),
+            )
+        )
+        budget_ids = {month: {} for month in months}
+        for month, type, budget_id in result.all():
+            budget_ids[month][type] = budget_id
+        return budget_ids
+
+    async def provision_month_budgets(
+        self, budgets: list[BudgetCreateSchema], user_id: str, month: datetime.date
+    ) -> dict:
+        created_at = datetime.datetime.now(datetime.timezone.utc)
+        statement = (
+            pg_insert(BudgetModel)
+            .values(
+                [
+                    {
+                        "id": generate_uuid(),
+                        "user_id": user_id,
+                        "month": month,
+                        "name": budget.name,
+                        "description": budget.description,
+                        "type": budget.type,
+                        "created_at": created_at,
+                    }
+                    for budget in budgets
+                ]
+            )
+            .on_conflict_do_nothing(
+                index_elements=["user_id", "month", "type"],
+                index_where=BudgetModel.deleted_at.is_(None),
+            )
+            .returning(BudgetModel.type, BudgetModel.id)
+        )
+        result = await self.db.execute(statement)
+        created = dict(result.all())
+        await persist(self.db)
+        return created
 
     async def delete_budget(self, budget_id: str):
-        self.db.query(BudgetModel).filter(BudgetModel.id == budget_id).update(
-            {"deleted_at": datetime.datetime.now(datetime.timezone.utc)}
+        await self.db.execute(
+            update(BudgetModel)
+            .where(BudgetModel.id == budget_id)
+            .values(deleted_at=datetime.datetime.now(datetime.timezone.utc))
         )
-        self.db.commit()
+        await self.db.commit()
         return {"message": "Budget deleted successfully"}
 
     async def update_budget(self, budget_id: str, update_data: dict):
-        self.db.query(BudgetModel).filter(BudgetModel.id == budget_id).update(
-            update_data
+        await self.db.execute(
+            update(BudgetModel).where(BudgetModel.id == budget_id).values(update_data)
         )
-        self.db.commit()
+        await self.db.commit()
         return await self.get_budget(budget_id)
-
-    async def bulk_budgets(self, budgets: list, user_id: str):
-        new_budgets = [
-            BudgetModel(
-                # TODO: Revisar si es necesario el id
-                user_id=user_id,
-                name=budget.name,
-                description=budget.description,
-                type=budget.type,
-            )
-            for budget in budgets
-        ]
-        self.db.bulk_save_objects(new_budgets)
-        self.db.commit()
-        return new_budgets
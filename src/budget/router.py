@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, status
-from src.user.dependencies import auth_dependency
+from src.user.dependencies import auth_dependency, check_not_modified
 from .dependencies import BudgetService, get_budget_service
 from src.schemas import ResponseNotFound
 from .schemas import BudgetResponseSchema, BudgetCreateSchema, BudgetUpdateSchema
@@ -20,7 +20,7 @@ async def get_budget(
     return await budget_service.get_budget_by_id(budget_id)
 
 
-@BudgetRouter.get("/budgets")
+@BudgetRouter.get("/budgets", dependencies=[Depends(check_not_modified)])
 async def get_budgets(
     current_user: auth_dependency,
     budget_service: BudgetService = Depends(get_budget_service),
@@ -51,7 +51,7 @@ async def delete_budget(
     current_user: auth_dependency,
     budget_service: BudgetService = Depends(get_budget_service),
 ):
-    await budget_service.delete_budget(budget_id)
+    await budget_service.delete_budget(budget_id, current_user.id)
     return {"message": "Budget deleted successfully"}
 
 
@@ -62,4 +62,6 @@ async def update_budget(
     current_user: auth_dependency,
     budget_service: BudgetService = Depends(get_budget_service),
 ):
-    return await budget_service.update_budget(budget_id, updated_budget)
+    return await budget_service.update_budget(
+        budget_id, updated_budget, current_user.id
+    )
@@ -1,5 +1,8 @@
 import datetime
+from src.cache import get_response_cache
+from src.config import current_month
 from src.exceptions import NotFoundError, BadRequestError
+from .cache import month_budget_cache
 from .repository import BudgetRepository
 from .schemas import (
     BudgetCreateSchema,
@@ -11,10 +14,13 @@ from .schemas import (
     BudgetTransactionCreateSchema,
 )
 
+MONTH_BUDGET_TYPES = ["Balanced", "Saving", "Debt"]
+
 
 class BudgetService:
     def __init__(self, budget_repository: BudgetRepository):
         self.budget_repository = budget_repository
+        self.response_cache = get_response_cache()
         # self.scheduler = BackgroundScheduler()
         # self.jobs = {}
 
@@ -45,6 +51,15 @@ class BudgetService:
         )
 
     async def get_budget_summary(self, user_id: str) -> dict:
+        return await self.response_cache.get_or_load(
+            user_id,
+            f"budgets:{current_month()}",
+            BudgetsResponseSchema,
+            lambda: self.load_budget_summary(user_id),
+            db=self.budget_repository.db,
+        )
+
+    async def load_budget_summary(self, user_id: str) -> dict:
         budgets = await self.budget_repository.get_budget_summary(user_id)
         if not budgets:
             return BudgetsResponseSchema(budgets=[])
@@ -70,39 +85,78 @@ class BudgetService:
             ]
         )
 
-    async def count_budgets_in_date_range(self, user_id: str) -> int:
-        now = datetime.datetime.now()
-        start_of_month = datetime.datetime(now.year, now.month, 1)
-        end_of_month = (
-            datetime.datetime(now.year, now.month + 1, 1)
-            if now.month < 12
-            else datetime.datetime(now.year + 1, 1, 1)
-        )
-        return await self.budget_repository.count_budgets_in_date_range(
-            start_of_month, end_of_month, user_id
+    async def provision_month_budgets(self, user_id: str, month: datetime.date) -> dict:
+        budget_ids = await self.budget_repository.get_month_budget_ids(user_id, month)
+        missing = [type for type in MONTH_BUDGET_TYPES if type not in budget_ids]
+        if not missing:
+            return budget_ids
+        month_name = month.strftime("%B %Y")
+        data_budgets = [
+            BudgetCreateSchema(
+                name="Budget for " + month_name,
+                type=type,
+                description=f"{month_name} Spending Summary",
+            )
+            for type in missing
+        ]
+        budget_ids.update(
+            await self.budget_repository.provision_month_budgets(
+                data_budgets, user_id, month
+            )
         )
+        if len(budget_ids) < len(MONTH_BUDGET_TYPES):
+            # Lost an insert race: the rows exist, read them back.
+            budget_ids = await self.budget_repository.get_month_budget_ids(
+                user_id, month
+            )
+        return budget_ids
+
+    async def get_month_budget_ids(self, user_id: str) -> list[str]:
+        month = current_month()
+        cached = month_budget_cache.get(user_id, month)
+        if cached is not None:
+            return cached
+        budget_ids = await self.budget_repository.get_month_budget_ids(user_id, month)
+        if len(budget_ids) == len(MONTH_BUDGET_TYPES):
+            month_budget_cache.set(user_id, month, list(budget_ids.values()))
+        else:
+            budget_ids = await self.provision_month_budgets(user_id, month)
+        return list(budget_ids.values())
+
+    async def get_budget_ids_by_month(
+        self, user_id: str, months: set[datetime.date]
+    ) -> dict[datetime.date, list[str]]:
+        """Month budget ids for several months at once: cached months are
+        free, the rest are read in one query and provisioned if missing."""
+        budget_ids = {}
+        for month in months:
+            cached = month_budget_cache.get(user_id, month)
+            if cached is not None:
+                budget_ids[month] = cached
+        uncached = [month for month in months if month not in budget_ids]
+        if not uncached:
+            return budget_ids
+        found = await self.budget_repository.get_budget_ids_by_month(user_id, uncached)
+        for month, month_ids in found.items():
+            if len(month_ids) == len(MONTH_BUDGET_TYPES):
+                month_budget_cache.set(user_id, month, list(month_ids.values()))
+            else:
+                month_ids = await self.provision_month_budgets(user_id, month)
+            budget_ids[month] = list(month_ids.values())
+        return budget_ids
 
     async def create_budget(self, budget: BudgetCreateSchema, user_id: str) -> dict:
         new_budget = await self.budget_repository.create_budget(budget, user_id)
+        await self.response_cache.invalidate(user_id)
         return BudgetResponseSchema(
             budget=BudgetDetailSchema.model_validate(new_budget)
         )
 
     async def auto_create_budget(self, user_id: str) -> dict:
-        # next_month = (datetime.datetime.now() + datetime.timedelta(days=30)).strftime(
-        #     "%B %Y"
-        # )
-        current_month = datetime.datetime.now().strftime("%B %Y")
-        type_budgets = ["Balanced", "Saving", "Debt"]
-        data_budgets = [
-            BudgetCreateSchema(
-                name="Budget for " + current_month,
-                type=type,
-                description=f"{current_month} Spending Summary",
-            )
-            for type in type_budgets
-        ]
-        new_budgets = await self.budget_repository.bulk_budgets(data_budgets, user_id)
+        month = current_month()
+        await self.provision_month_budgets(user_id, month)
+        await self.response_cache.invalidate(user_id)
+        new_budgets = await self.budget_repository.get_month_budgets(user_id, month)
         return BudgetsResponseSchema(
             budgets=[
                 BudgetDetailSchema.model_validate(budget) for budget in new_budgets
@@ -117,14 +171,26 @@ class BudgetService:
         )
         return True  # TODO: Revisar que devolver
 
-    async def delete_budget(self, budget_id: str) -> None:
+    async def create_budget_transactions(
+        self, budget_transactions: list[BudgetTransactionCreateSchema]
+    ) -> None:
+        await self.budget_repository.bulk_budget_transactions(budget_transactions)
+
+    async def delete_budget(self, budget_id: str, user_id: str) -> None:
         await self.budget_repository.delete_budget(budget_id)
+        month_budget_cache.discard_budget(budget_id)
+        await self.response_cache.invalidate(user_id)
 
-    async def update_budget(self, budget_id: str, budget: BudgetUpdateSchema) -> dict:
+    async def update_budget(
+        self, budget_id: str, budget: BudgetUpdateSchema, user_id: str
+    ) -> dict:
         update_data = budget.model_dump(exclude_unset=True)
         updated_budget = await self.budget_repository.update_budget(
             budget_id, update_data
         )
+        # May have been retyped or soft-deleted: stop linking transactions.
+        month_budget_cache.discard_budget(budget_id)
+        await self.response_cache.invalidate(user_id)
         total_spent = sum(
             transaction.amount for transaction in updated_budget.transactions
         )
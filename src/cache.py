@@ -0,0 +1,177 @@
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Awaitable, Callable
+from pydantic import BaseModel
+from src.settings import get_settings
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def snapshot(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class ResponseCache:
+    """Per-user cache of read responses.
+
+    Entries are grouped by user so a write service drops everything cached
+    for that user with a single ``invalidate``. Backends store ``BaseModel``
+    responses; ``get`` takes the schema so shared backends can decode them.
+    """
+
+    backend = "none"
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    async def get(self, user_id: str, name: str, schema: type[BaseModel]):
+        self.stats.misses += 1
+        return None
+
+    async def set(self, user_id: str, name: str, value: BaseModel) -> None:
+        pass
+
+    async def invalidate(self, user_id: str) -> None:
+        self.stats.invalidations += 1
+
+    async def get_or_load(
+        self,
+        user_id: str,
+        name: str,
+        schema: type[BaseModel],
+        load: Callable[[], Awaitable[BaseModel]],
+        db=None,
+    ) -> BaseModel:
+        """Return the cached response or store what ``load`` reads from
+        ``db``. Loads run on the primary: a replica lagging behind a write
+        would otherwise put pre-write data back right after ``invalidate``,
+        for the whole TTL and for every worker sharing the cache."""
+        value = await self.get(user_id, name, schema)
+        if value is None:
+            if db is not None:
+                db.info["use_primary"] = True
+            value = await load()
+            await self.set(user_id, name, value)
+        return value
+
+    def snapshot(self) -> dict:
+        return {"backend": self.backend, **self.stats.snapshot()}
+
+
+class LocalLRUCache(ResponseCache):
+    """In-process LRU over users, each entry expiring ``ttl`` seconds after
+    it was stored. Per worker: use ``RedisCache`` when running several."""
+
+    backend = "memory"
+
+    def __init__(self, max_users: int, ttl: float):
+        super().__init__()
+        self.max_users = max_users
+        self.ttl = ttl
+        self.users: OrderedDict[str, dict] = OrderedDict()
+
+    async def get(self, user_id: str, name: str, schema: type[BaseModel]):
+        entries = self.users.get(user_id)
+        entry = entries.get(name) if entries else None
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del entries[name]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self.users.move_to_end(user_id)
+        self.stats.hits += 1
+        return value
+
+    async def set(self, user_id: str, name: str, value: BaseModel) -> None:
+        entries = self.users.setdefault(user_id, {})
+        entries[name] = (time.monotonic() + self.ttl, value)
+        self.users.move_to_end(user_id)
+        while len(self.users) > self.max_users:
+            _, evicted = self.users.popitem(last=False)
+            self.stats.evictions += len(evicted)
+
+    async def invalidate(self, user_id: str) -> None:
+        self.users.pop(user_id, None)
+        self.stats.invalidations += 1
+
+    def snapshot(self) -> dict:
+        return {
+            **super().snapshot(),
+            "users": len(self.users),
+            "max_users": self.max_users,
+        }
+
+
+class RedisCache(ResponseCache):
+    """Shared cache on a Redis-compatible server (Redis, Valkey, KeyDB...).
+
+    One hash per user holds that user's responses as JSON and expires ``ttl``
+    seconds after its last write; invalidation deletes the hash. Capacity and
+    eviction are the server's ``maxmemory``/``maxmemory-policy``; set
+    ``volatile-lru`` or ``allkeys-lru``. Requires the ``redis`` package.
+    """
+
+    backend = "redis"
+
+    def __init__(self, url: str, ttl: float, prefix: str = "response-cache"):
+        try:
+            from redis import asyncio as redis
+        except ImportError as error:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the redis package"
+            ) from error
+        super().__init__()
+        self.client = redis.from_url(url)
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    def key(self, user_id: str) -> str:
+        return f"{self.prefix}:{user_id}"
+
+    async def get(self, user_id: str, name: str, schema: type[BaseModel]):
+        payload = await self.client.hget(self.key(user_id), name)
+        if payload is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return schema.model_validate_json(payload)
+
+    async def set(self, user_id: str, name: str, value: BaseModel) -> None:
+        key = self.key(user_id)
+        async with self.client.pipeline(transaction=True) as pipeline:
+            pipeline.hset(key, name, value.model_dump_json())
+            pipeline.expire(key, self.ttl)
+            await pipeline.execute()
+
+    async def invalidate(self, user_id: str) -> None:
+        await self.client.delete(self.key(user_id))
+        self.stats.invalidations += 1
+
+
+@lru_cache()
+def get_response_cache() -> ResponseCache:
+    settings = get_settings()
+    if settings.CACHE_BACKEND == "memory":
+        return LocalLRUCache(settings.CACHE_MAX_USERS, settings.CACHE_TTL_SECONDS)
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCache(settings.CACHE_URL, settings.CACHE_TTL_SECONDS)
+    return ResponseCache()
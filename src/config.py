@@ -1,4 +1,5 @@
 import uuid
+import datetime
 from fastapi.security import OAuth2PasswordBearer
 
 
@@ -6,4 +7,9 @@ def generate_uuid():
     return str(uuid.uuid4())
 
 
+def current_month() -> datetime.date:
+    # UTC, like the created_at timestamps rebuild_totals buckets by.
+    return datetime.datetime.now(datetime.timezone.utc).date().replace(day=1)
+
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
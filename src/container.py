@@ -0,0 +1,71 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import httpx
+from openai import AsyncOpenAI
+from supabase import Client, ClientOptions, create_client
+from src.ai.cache import AIQueryCache
+from src.ai.schema import SchemaDescription
+from src.cache import ResponseCache, get_response_cache
+from src.models import metadata
+from src.settings import Settings
+from src.user.token import TokenUserCache, TokenVerifier
+
+
+class ServiceContainer:
+    """Application-scoped objects, built once in the app lifespan.
+
+    Holds everything that is safe to share between requests: settings, the
+    Supabase client used for stateless auth calls, the token verifier, the
+    token to user cache, the response cache, the OpenAI client, the schema
+    description sent to the model, the AI query cache and the process pool for
+    CPU-bound work. Services and repositories stay request-scoped because they
+    wrap the request's database session.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.supabase = self.create_supabase_client()
+        self.token_verifier = TokenVerifier(settings)
+        self.token_cache = TokenUserCache(
+            settings.AUTH_TOKEN_CACHE_SIZE, settings.AUTH_NEGATIVE_CACHE_SECONDS
+        )
+        self.response_cache: ResponseCache = get_response_cache()
+        self.openai = self.create_openai_client()
+        self.ai_schema = SchemaDescription(metadata)
+        # Render now so no request pays for it.
+        self.ai_schema.text
+        self.ai_cache = AIQueryCache(
+            settings.AI_SQL_CACHE_SIZE,
+            settings.AI_ROWS_CACHE_SIZE,
+            settings.AI_ANSWER_CACHE_SIZE,
+        )
+        # Workers start on first use. Spawned, not forked: the parent runs
+        # an event loop and database driver threads.
+        self.process_pool = ProcessPoolExecutor(
+            max_workers=settings.SIMULATION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def create_supabase_client(self) -> Client:
+        return create_client(
+            supabase_url=self.settings.SUPABASE_URL,
+            supabase_key=self.settings.SUPABASE_KEY,
+            options=ClientOptions(persist_session=False, auto_refresh_token=False),
+        )
+
+    def create_openai_client(self) -> AsyncOpenAI:
+        return AsyncOpenAI(
+            api_key=self.settings.OPENAI_API_KEY,
+            timeout=httpx.Timeout(
+                self.settings.OPENAI_TIMEOUT_SECONDS,
+                connect=self.settings.OPENAI_CONNECT_TIMEOUT_SECONDS,
+            ),
+            max_retries=self.settings.OPENAI_MAX_RETRIES,
+        )
+
+    async def close(self) -> None:
+        await self.openai.close()
+        self.process_pool.shutdown(wait=False, cancel_futures=True)
+        jwks = self.token_verifier.jwks
+        if jwks is not None and jwks.refresh_task is not None:
+            jwks.refresh_task.cancel()
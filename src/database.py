@@ -1,31 +1,286 @@
-from sqlalchemy import create_engine, MetaData
-from sqlalchemy.orm import sessionmaker
+import time
+from contextlib import asynccontextmanager
+from sqlalchemy import create_engine, event, Delete, Insert, Update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from .settings import get_settings
+from .pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from .settings import Settings, get_settings
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    url = make_url(database_url)
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def get_pool_options(settings: Settings) -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the replica engine and writes to the primary.
+
+    Once the session has written, or ``info["use_primary"]`` is set for a user
+    with a recent write, every following statement stays on the primary so
+    the request reads its own writes. Statements inside a unit of work and
+    ``SELECT ... FOR UPDATE`` also go to the primary: the reads there feed
+    writes, and locks only mean something on the primary.
+    """
+
+    def __init__(self, replica=None, **kwargs):
+        super().__init__(**kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.info["wrote"] = True
+            self.info["uncommitted_write"] = True
+        if (
+            self.replica is None
+            or self.info.get("wrote")
+            or self.info.get("use_primary")
+            or self.info.get("unit_of_work")
+            or getattr(clause, "_for_update_arg", None) is not None
+        ):
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        return self.replica
+
 
 settings = get_settings()
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(
+    settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    **get_pool_options(settings),
+)
+read_engine = None
+if settings.READ_DATABASE_URL:
+    read_engine = create_engine(
+        settings.READ_DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        **get_pool_options(settings),
+    )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    class_=RoutingSession,
+    replica=read_engine,
+)
+
+async_engine = None
+async_read_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    async_engine = create_async_engine(
+        get_async_database_url(settings.DATABASE_URL),
+        poolclass=InstrumentedAsyncQueuePool,
+        **get_pool_options(settings),
+    )
+    if settings.READ_DATABASE_URL:
+        async_read_engine = create_async_engine(
+            get_async_database_url(settings.READ_DATABASE_URL),
+            poolclass=InstrumentedAsyncQueuePool,
+            **get_pool_options(settings),
+        )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        replica=async_read_engine.sync_engine if async_read_engine else None,
+    )
 
 Base = declarative_base()
 
+_recent_writes: dict[str, float] = {}
+MAX_TRACKED_WRITERS = 10000
+
+
+def bind_session_user(db, user_id: str) -> None:
+    """Tag the request session with its user and pin it to the primary when
+    that user wrote within ``READ_YOUR_WRITES_SECONDS``."""
+    db.info["user_id"] = user_id
+    wrote_at = _recent_writes.get(user_id)
+    if (
+        wrote_at is not None
+        and time.monotonic() - wrote_at < settings.READ_YOUR_WRITES_SECONDS
+    ):
+        db.info["use_primary"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def record_user_write(session):
+    user_id = session.info.get("user_id")
+    if not user_id or not session.info.get("wrote"):
+        return
+    now = time.monotonic()
+    if len(_recent_writes) >= MAX_TRACKED_WRITERS:
+        window = settings.READ_YOUR_WRITES_SECONDS
+        for key, wrote_at in list(_recent_writes.items()):
+            if now - wrote_at >= window:
+                del _recent_writes[key]
+    _recent_writes[user_id] = now
+
+
+@event.listens_for(RoutingSession, "after_commit")
+@event.listens_for(RoutingSession, "after_rollback")
+def clear_uncommitted_write(session):
+    session.info.pop("uncommitted_write", None)
+
+
+class SyncSessionAdapter:
+    """Exposes a synchronous ``Session`` through the ``AsyncSession`` API.
+
+    Repositories are written against ``AsyncSession``; when ``DATABASE_ASYNC``
+    is disabled they receive this adapter so the same code keeps working on
+    the psycopg2 engine.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    @property
+    def info(self) -> dict:
+        return self.sync_session.info
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, params=None, **kwargs):
+        return self.sync_session.execute(statement, params, **kwargs)
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return self.sync_session.scalar(statement, params, **kwargs)
 
-def get_db():
-    db = SessionLocal()
+    async def scalars(self, statement, params=None, **kwargs):
+        return self.sync_session.scalars(statement, params, **kwargs)
+
+    async def stream(self, statement, params=None, **kwargs):
+        return SyncStreamResult(
+            self.sync_session.execute(
+                statement.execution_options(stream_results=True), params, **kwargs
+            )
+        )
+
+    async def get(self, entity, ident, **kwargs):
+        return self.sync_session.get(entity, ident, **kwargs)
+
+    async def delete(self, instance) -> None:
+        self.sync_session.delete(instance)
+
+    async def flush(self, objects=None) -> None:
+        self.sync_session.flush(objects)
+
+    async def refresh(self, instance, attribute_names=None) -> None:
+        self.sync_session.refresh(instance, attribute_names)
+
+    async def commit(self) -> None:
+        self.sync_session.commit()
+
+    async def rollback(self) -> None:
+        self.sync_session.rollback()
+
+    async def close(self) -> None:
+        self.sync_session.close()
+
+
+class SyncStreamResult:
+    """The subset of ``AsyncResult`` used for streaming reads."""
+
+    def __init__(self, result):
+        self.result = result
+
+    async def partitions(self, size=None):
+        for rows in self.result.partitions(size):
+            yield rows
+
+    async def fetchmany(self, size=None):
+        return self.result.fetchmany(size)
+
+    async def close(self) -> None:
+        self.result.close()
+
+
+class UnitOfWork:
+    """Commits every repository write made inside the block exactly once.
+
+    While active, repositories only flush (see ``persist``). Nested units of
+    work join the outermost one. Disabled by ``UNIT_OF_WORK=false``.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.owner = settings.UNIT_OF_WORK and not db.info.get("unit_of_work")
+
+    async def __aenter__(self):
+        if self.owner:
+            self.db.info["unit_of_work"] = True
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        if not self.owner:
+            return False
+        self.db.info.pop("unit_of_work", None)
+        if exc_type is None:
+            await self.db.commit()
+        else:
+            await self.db.rollback()
+        return False
+
+
+async def persist(db, *instances) -> None:
+    if db.info.get("unit_of_work"):
+        await db.flush()
+        return
+    await db.commit()
+    for instance in instances:
+        await db.refresh(instance)
+
+
+@asynccontextmanager
+async def open_session():
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+    db = SyncSessionAdapter(SessionLocal())
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+
+async def get_db():
+    async with open_session() as db:
+        yield db
 
 
-def get_schema():
-    metadata = MetaData()
-    metadata.reflect(bind=engine)
-    schema = {}
-    for table in metadata.tables.values():
-        schema[table.name] = {column.name: str(column.type) for column in table.columns}
-    return schema
+def get_pool_stats() -> dict:
+    stats = {"primary": engine.pool.snapshot()}
+    if read_engine is not None:
+        stats["replica"] = read_engine.pool.snapshot()
+    if async_engine is not None:
+        stats["primary_async"] = async_engine.pool.snapshot()
+    if async_read_engine is not None:
+        stats["replica_async"] = async_read_engine.pool.snapshot()
+    return stats
 
 
 def query():
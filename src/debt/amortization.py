@@ -0,0 +1,96 @@
+import datetime
+from typing import NamedTuple
+import numpy as np
+from .models import PERIOD_DAYS, PaymentFrequency
+
+PERIODS_PER_YEAR = {
+    PaymentFrequency.WEEKLY: 52,
+    PaymentFrequency.BIWEEKLY: 26,
+    PaymentFrequency.MONTHLY: 12,
+    PaymentFrequency.QUARTERLY: 4,
+    PaymentFrequency.YEARLY: 1,
+}
+
+
+class Amortization(NamedTuple):
+    """Schedules of several debts as ``(debts, installments)`` arrays, padded
+    with zeros past each debt's ``counts``."""
+
+    counts: np.ndarray
+    payment: np.ndarray
+    interest: np.ndarray
+    principal: np.ndarray
+    balance: np.ndarray
+
+
+def period_rates(annual_rates, frequencies) -> np.ndarray:
+    """Annual percentage rates to per-installment rates."""
+    periods = np.array(
+        [
+            PERIODS_PER_YEAR[frequency or PaymentFrequency.MONTHLY]
+            for frequency in frequencies
+        ],
+        dtype=float,
+    )
+    return np.asarray(annual_rates, dtype=float) / 100 / periods
+
+
+def installment_payments(amounts, rates, counts) -> np.ndarray:
+    """Level payment that repays each amount in ``counts`` installments; a
+    debt without installments is paid at once."""
+    amounts = np.asarray(amounts, dtype=float)
+    counts = np.asarray(counts, dtype=int)
+    rates = np.where(counts > 0, np.asarray(rates, dtype=float), 0)
+    counts = np.maximum(counts, 1)
+    growth = (1 + rates) ** -counts
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = rates * amounts / (1 - growth)
+    return np.where(rates > 0, annuity, amounts / counts)
+
+
+def amortize(amounts, rates, counts) -> Amortization:
+    """Amortize every debt at once, ``rates`` being per installment."""
+    amounts = np.asarray(amounts, dtype=float)[:, None]
+    counts = np.asarray(counts, dtype=int)
+    rates = np.where(counts > 0, np.asarray(rates, dtype=float), 0)[:, None]
+    counts = np.maximum(counts, 1)
+    installments = np.arange(counts.max(initial=1) + 1)[None, :]
+
+    # Remaining balance after k of n level payments is
+    # amount * (1 - (1+r)^(k-n)) / (1 - (1+r)^-n); expm1/log1p keep it exact
+    # for both tiny rates and long high-rate schedules. Computed in place:
+    # the arrays are (debts, installments) and allocation dominates.
+    log_growth = np.log1p(rates)
+    balance = np.subtract(installments, counts[:, None], dtype=float)
+    balance *= log_growth
+    np.expm1(balance, out=balance)
+    # Interest-free rows divide by zero here; they are filled in below.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        balance *= amounts / np.expm1(-counts[:, None] * log_growth)
+    interest_free = rates[:, 0] == 0
+    if interest_free.any():
+        balance[interest_free] = amounts[interest_free] * (
+            1 - installments / counts[interest_free, None]
+        )
+    np.maximum(balance, 0, out=balance)
+    # Also clears the cents floating point leaves after the last installment,
+    # so every column past it amortizes nothing.
+    balance[installments >= counts[:, None]] = 0
+
+    opening = balance[:, :-1]
+    interest = opening * rates
+    principal = opening - balance[:, 1:]
+    return Amortization(
+        counts=counts,
+        payment=interest + principal,
+        interest=interest,
+        principal=principal,
+        balance=balance[:, 1:],
+    )
+
+
+def installment_dates(
+    first_due_date: datetime.datetime, frequency, count: int
+) -> list[datetime.datetime]:
+    step = datetime.timedelta(days=PERIOD_DAYS[frequency or PaymentFrequency.MONTHLY])
+    return [first_due_date + step * number for number in range(count)]
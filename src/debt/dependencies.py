@@ -1,15 +1,23 @@
-from src.dependencies import db_dependency
+from src.dependencies import container_dependency, db_dependency
+from src.summary.dependencies import get_summary_service
 from src.transaction.dependencies import get_transaction_service
 from .repository import DebtRepository, DebtPaymentRepository
-from .services import DebtService, DebtPaymentService
+from .services import DebtService, DebtPaymentService, DebtSimulationService
 
 
 def get_debt_service(db: db_dependency) -> DebtService:
-    return DebtService(DebtRepository(db))
+    return DebtService(DebtRepository(db), get_summary_service(db))
+
+
+def get_debt_simulation_service(
+    db: db_dependency, container: container_dependency
+) -> DebtSimulationService:
+    return DebtSimulationService(DebtRepository(db), container.process_pool)
 
 
 def get_debt_payment_service(db: db_dependency) -> DebtPaymentService:
     return DebtPaymentService(
         DebtPaymentRepository(db),
         get_transaction_service(db),
+        get_summary_service(db),
     )
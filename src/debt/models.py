@@ -1,6 +1,17 @@
 import enum
 import datetime
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Enum, Float, event
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Integer,
+    String,
+    DateTime,
+    Enum,
+    Float,
+    Index,
+    event,
+    text,
+)
 from sqlalchemy.orm import relationship
 from src.config import generate_uuid
 from src.database import Base
@@ -21,9 +32,28 @@ class PaymentFrequency(enum.Enum):
     YEARLY = "yearly"
 
 
+# Days between installments, also used to project payment dates.
+PERIOD_DAYS = {
+    PaymentFrequency.WEEKLY: 7,
+    PaymentFrequency.BIWEEKLY: 15,
+    PaymentFrequency.MONTHLY: 30,
+    PaymentFrequency.QUARTERLY: 90,
+    PaymentFrequency.YEARLY: 365,
+}
+
+
 class DebtModel(Base):
     __tablename__ = "debts"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_debts_user_id_status", "user_id", "status"),
+        Index(
+            "ix_debts_user_id_next_payment_date",
+            "user_id",
+            "next_payment_date",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        {"extend_existing": True},
+    )
 
     id = Column(String, primary_key=True, index=True, default=generate_uuid)
     user_id = Column(String, ForeignKey("users.id"), nullable=True, index=True)
@@ -38,6 +68,11 @@ class DebtModel(Base):
     payment_frequency = Column(
         Enum(PaymentFrequency), nullable=True, default=PaymentFrequency.MONTHLY
     )
+    # Maintained by record_payment / refresh_payment_dates.
+    last_payment_date = Column(DateTime, nullable=True)
+    installments_paid = Column(Integer, nullable=False, default=0, server_default="0")
+    next_payment_date = Column(DateTime, nullable=True)
+    estimated_completion_date = Column(DateTime, nullable=True)
     created_at = Column(DateTime, nullable=True)
     updated_at = Column(DateTime, nullable=True)
     deleted_at = Column(DateTime, nullable=True)
@@ -45,89 +80,36 @@ class DebtModel(Base):
     debt_payments = relationship("DebtPaymentModel", back_populates="debt")
     user = relationship("UserModel", back_populates="debts")
 
-    @property
-    def next_payment_date(self):
+    def record_payment(
+        self, payment_date: datetime.datetime, installment_number: int
+    ) -> None:
+        if self.last_payment_date is None or payment_date >= self.last_payment_date:
+            self.last_payment_date = payment_date
+        self.installments_paid = max(self.installments_paid or 0, installment_number)
+        self.refresh_payment_dates()
+
+    def refresh_payment_dates(self) -> None:
+        """Project the next and last installment dates from the stored last
+        payment; called whenever a payment or the status changes."""
         if self.status == DebtStatus.PAID:
-            return None
-
-        if self.debt_payments:
-            last_payment = sorted(
-                self.debt_payments, key=lambda p: p.payment_date, reverse=True
-            )[0]
-            last_payment_date = last_payment.payment_date
-            last_installment = last_payment.installment_number
+            self.next_payment_date = None
+            self.estimated_completion_date = self.last_payment_date
+            return
+        step = datetime.timedelta(
+            days=PERIOD_DAYS[self.payment_frequency or PaymentFrequency.MONTHLY]
+        )
+        remaining = self.installment_count - (self.installments_paid or 0)
+        if self.last_payment_date is None:
+            self.next_payment_date = self.due_date
+        elif remaining <= 0:
+            self.next_payment_date = None
         else:
-            return self.due_date
-
-        if last_installment >= self.installment_count:
-            return None
-
-        days_to_add = 30
-
-        if self.payment_frequency is not None:
-            if self.payment_frequency == PaymentFrequency.WEEKLY:
-                days_to_add = 7
-            elif self.payment_frequency == PaymentFrequency.BIWEEKLY:
-                days_to_add = 15
-            elif self.payment_frequency == PaymentFrequency.MONTHLY:
-                days_to_add = 30
-            elif self.payment_frequency == PaymentFrequency.QUARTERLY:
-                days_to_add = 90
-            elif self.payment_frequency == PaymentFrequency.YEARLY:
-                days_to_add = 365
-
-        next_date = last_payment_date + datetime.timedelta(days=days_to_add)
-        return next_date
-
-    @property
-    def estimated_completion_date(self):
-        if self.status == DebtStatus.PAID:
-            if self.debt_payments:
-                return sorted(
-                    self.debt_payments, key=lambda p: p.payment_date, reverse=True
-                )[0].payment_date
-            return None
-
-        if self.installment_count <= 0:
-            return None
-
-        installments_paid = 0
-        if self.debt_payments:
-            installments_paid = max(
-                payment.installment_number for payment in self.debt_payments
-            )
-
-        remaining_installments = self.installment_count - installments_paid
-
-        if remaining_installments <= 0:
-            return None
-
-        if self.debt_payments:
-            last_payment = sorted(
-                self.debt_payments, key=lambda p: p.payment_date, reverse=True
-            )[0]
-            start_date = last_payment.payment_date
+            self.next_payment_date = self.last_payment_date + step
+        if self.installment_count <= 0 or remaining <= 0:
+            self.estimated_completion_date = None
         else:
-            start_date = self.due_date
-
-        days_per_payment = 30
-
-        if self.payment_frequency is not None:
-            if self.payment_frequency == PaymentFrequency.WEEKLY:
-                days_per_payment = 7
-            elif self.payment_frequency == PaymentFrequency.BIWEEKLY:
-                days_per_payment = 15
-            elif self.payment_frequency == PaymentFrequency.MONTHLY:
-                days_per_payment = 30
-            elif self.payment_frequency == PaymentFrequency.QUARTERLY:
-                days_per_payment = 90
-            elif self.payment_frequency == PaymentFrequency.YEARLY:
-                days_per_payment = 365
-
-        days_to_add = remaining_installments * days_per_payment
-        completion_date = start_date + datetime.timedelta(days=days_to_add)
-
-        return completion_date
+            start = self.last_payment_date or self.due_date
+            self.estimated_completion_date = start + remaining * step
 
 
 @event.listens_for(DebtModel, "before_update")
@@ -145,8 +127,10 @@ class DebtPaymentModel(Base):
     __table_args__ = {"extend_existing": True}
 
     id = Column(String, primary_key=True, index=True, default=generate_uuid)
-    debt_id = Column(String, ForeignKey("debts.id"), nullable=False)
-    transaction_id = Column(String, ForeignKey("transactions.id"), nullable=False)
+    debt_id = Column(String, ForeignKey("debts.id"), nullable=False, index=True)
+    transaction_id = Column(
+        String, ForeignKey("transactions.id"), nullable=False, index=True
+    )
     payment_date = Column(DateTime, nullable=False)
     amount_paid = Column(Integer, nullable=False, default=0)
     installment_number = Column(Integer, nullable=False, default=0)
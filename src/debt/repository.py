@@ -1,92 +1,128 @@
-from sqlalchemy import func
-from sqlalchemy.orm import Session, selectinload
+import datetime
+from sqlalchemy import case, insert, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from src.database import UnitOfWork, persist
 from src.settings import get_settings
-from src.budget.models import BudgetTransactionModel, BudgetModel
 from src.transaction.models import TransactionModel
-from .models import DebtModel, DebtPaymentModel
+from .amortization import installment_payments, period_rates
+from .models import DebtModel, DebtPaymentModel, DebtStatus
 from .schemas import DebtCreateSchema, DebtPaymentCreateSchema
 
 
 class DebtRepository:
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.settings = get_settings()
 
+    def unit_of_work(self) -> UnitOfWork:
+        return UnitOfWork(self.db)
+
     async def get_debt_by_id(self, debt_id: str) -> dict:
-        return (
-            self.db.query(DebtModel)
+        result = await self.db.execute(
+            select(DebtModel)
             .options(selectinload(DebtModel.debt_payments))
             .filter(DebtModel.id == debt_id)
-            .first()
         )
+        return result.scalars().first()
 
-    async def get_debts_by_user_id(self, user_id: str) -> dict:
-        payment_count_subq = (
-            self.db.query(
+    def payment_totals(self, user_id: str):
+        return (
+            select(
                 DebtPaymentModel.debt_id,
                 func.count(DebtPaymentModel.id).label("paid_installments"),
                 func.sum(DebtPaymentModel.amount_paid).label("total_paid"),
             )
+            .join(DebtModel, DebtModel.id == DebtPaymentModel.debt_id)
+            .filter(DebtModel.user_id == user_id)
             .group_by(DebtPaymentModel.debt_id)
             .subquery()
         )
 
-        query = (
-            self.db.query(
+    def debts_query(self, user_id: str):
+        """The user's debts with their payment totals, and the portfolio
+        totals repeated on every row as window aggregates.
+
+        Payments are aggregated only for this user's debts, so the cost
+        follows the user's data rather than the whole table.
+        """
+        payments = self.payment_totals(user_id)
+        total_paid = func.coalesce(payments.c.total_paid, 0)
+        outstanding = case(
+            (DebtModel.status == DebtStatus.PAID, 0),
+            (total_paid >= DebtModel.amount, 0),
+            else_=DebtModel.amount - total_paid,
+        )
+        total_outstanding = func.sum(outstanding).over()
+        return (
+            select(
                 DebtModel,
-                func.coalesce(payment_count_subq.c.paid_installments, 0).label(
+                func.coalesce(payments.c.paid_installments, 0).label(
                     "paid_installments"
                 ),
-                func.coalesce(payment_count_subq.c.total_paid, 0).label("total_paid"),
-            )
-            .outerjoin(
-                payment_count_subq,
-                DebtModel.id == payment_count_subq.c.debt_id,
-            )
-            .outerjoin(
-                BudgetTransactionModel,
-                DebtModel.id == BudgetTransactionModel.transaction_id,
+                total_paid.label("total_paid"),
+                total_outstanding.label("total_outstanding"),
+                (
+                    func.sum(outstanding * DebtModel.interest_rate).over()
+                    / func.nullif(total_outstanding, 0)
+                ).label("weighted_interest_rate"),
+                func.sum(total_paid).over().label("portfolio_paid"),
             )
-            .outerjoin(BudgetModel, BudgetTransactionModel.budget_id == BudgetModel.id)
+            .outerjoin(payments, DebtModel.id == payments.c.debt_id)
             .filter(DebtModel.user_id == user_id)
-            .distinct()
         )
-        results = query.all()
-        return results
+
+    async def get_debts_by_user_id(self, user_id: str) -> dict:
+        results = await self.db.execute(self.debts_query(user_id))
+        return results.all()
 
     async def get_debts_by_user_id_and_status(self, user_id: str, status: str) -> dict:
-        return (
-            self.db.query(DebtModel)
+        result = await self.db.execute(
+            select(DebtModel)
+            .options(selectinload(DebtModel.debt_payments))
             .filter(DebtModel.user_id == user_id, DebtModel.status == status)
-            .all()
         )
+        return result.scalars().all()
 
     async def get_debts_by_user_id_and_due_date(
         self, user_id: str, due_date: str
     ) -> dict:
-        return (
-            self.db.query(DebtModel)
+        result = await self.db.execute(
+            select(DebtModel)
+            .options(selectinload(DebtModel.debt_payments))
             .filter(DebtModel.user_id == user_id, DebtModel.due_date == due_date)
-            .all()
         )
+        return result.scalars().all()
+
+    def due_before_query(self, user_id: str, until: datetime.datetime):
+        payments = self.payment_totals(user_id)
+        return (
+            select(
+                DebtModel,
+                func.coalesce(payments.c.paid_installments, 0).label(
+                    "paid_installments"
+                ),
+                func.coalesce(payments.c.total_paid, 0).label("total_paid"),
+            )
+            .outerjoin(payments, DebtModel.id == payments.c.debt_id)
+            .filter(
+                DebtModel.user_id == user_id,
+                DebtModel.deleted_at.is_(None),
+                DebtModel.next_payment_date <= until,
+            )
+            .order_by(DebtModel.next_payment_date)
+        )
+
+    async def get_debts_due_before(self, user_id: str, until: datetime.datetime):
+        result = await self.db.execute(self.due_before_query(user_id, until))
+        return result.all()
 
     async def create_debt(self, debt: DebtCreateSchema, user_id: str) -> dict:
-        minimum_payment = 0
-        if debt.installment_count > 0:
-            if hasattr(debt, "interest_rate") and debt.interest_rate:
-                interest_decimal = debt.interest_rate / 100
-                monthly_rate = interest_decimal / 12
-                if monthly_rate > 0:
-                    minimum_payment = (monthly_rate * debt.amount) / (
-                        1 - (1 + monthly_rate) ** -debt.installment_count
-                    )
-                else:
-                    minimum_payment = debt.amount / debt.installment_count
-            else:
-                minimum_payment = debt.amount / debt.installment_count
-        else:
-            minimum_payment = debt.amount
+        rates = period_rates([debt.interest_rate], [debt.payment_frequency])
+        minimum_payment = installment_payments(
+            [debt.amount], rates, [debt.installment_count]
+        )[0]
 
         new_debt = DebtModel(
             user_id=user_id,
@@ -96,49 +132,58 @@ class DebtRepository:
             due_date=debt.due_date,
             status=debt.status,
             installment_count=debt.installment_count,
-            minimum_payment=minimum_payment,
+            minimum_payment=float(minimum_payment),
+            interest_rate=debt.interest_rate,
+            payment_frequency=debt.payment_frequency,
         )
+        new_debt.refresh_payment_dates()
         self.db.add(new_debt)
-        self.db.commit()
-        self.db.refresh(new_debt)
+        await persist(self.db, new_debt)
         return new_debt
 
     async def update_debt(self, debt: DebtModel) -> dict:
+        debt.refresh_payment_dates()
         self.db.add(debt)
-        self.db.commit()
-        self.db.refresh(debt)
+        await self.db.commit()
+        await self.db.refresh(debt)
         return debt
 
     async def delete_debt(self, debt_id: str) -> dict:
-        debt = self.db.query(DebtModel).filter(DebtModel.id == debt_id).first()
-        self.db.delete(debt)
-        self.db.commit()
+        debt = await self.db.get(DebtModel, debt_id)
+        await self.db.delete(debt)
+        await self.db.commit()
         return debt
 
 
 class DebtPaymentRepository:
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.settings = get_settings()
 
+    def unit_of_work(self) -> UnitOfWork:
+        return UnitOfWork(self.db)
+
     async def get_debt_payment_by_id(self, debt_payment_id: str) -> dict:
-        return (
-            self.db.query(DebtPaymentModel)
-            .filter(DebtPaymentModel.id == debt_payment_id)
-            .first()
+        result = await self.db.execute(
+            select(DebtPaymentModel).filter(DebtPaymentModel.id == debt_payment_id)
         )
+        return result.scalars().first()
 
     async def get_debt_payments_by_debt_id(self, debt_id: str) -> dict:
-        return (
-            self.db.query(DebtPaymentModel)
-            .filter(DebtPaymentModel.debt_id == debt_id)
-            .all()
+        result = await self.db.execute(
+            select(DebtPaymentModel).filter(DebtPaymentModel.debt_id == debt_id)
         )
+        return result.scalars().all()
 
     async def create_debt_payment(
-        self, debt_payment: DebtPaymentCreateSchema, transaction_id: str
+        self,
+        debt_payment: DebtPaymentCreateSchema,
+        transaction_id: str,
+        debt: DebtModel,
     ) -> dict:
+        """Insert a payment for ``debt``, which the caller has already locked
+        with ``get_user_debts_for_update``."""
         new_debt_payment = DebtPaymentModel(
             debt_id=debt_payment.debt_id,
             transaction_id=transaction_id,
@@ -148,10 +193,40 @@ class DebtPaymentRepository:
             status=debt_payment.status,
         )
         self.db.add(new_debt_payment)
-        self.db.commit()
-        self.db.refresh(new_debt_payment)
+        debt.record_payment(debt_payment.payment_date, debt_payment.installment_number)
+        await persist(self.db, new_debt_payment)
         return new_debt_payment
 
+    async def get_user_debts_for_update(
+        self, user_id: str, debt_ids: list[str]
+    ) -> dict[str, DebtModel]:
+        # Locked before any payment is inserted, since the insert's foreign
+        # key check share-locks the debt, and in id order so concurrent
+        # batches cannot deadlock.
+        result = await self.db.execute(
+            select(DebtModel)
+            .filter(
+                DebtModel.id.in_(debt_ids),
+                DebtModel.user_id == user_id,
+                DebtModel.deleted_at.is_(None),
+            )
+            .order_by(DebtModel.id)
+            .with_for_update()
+        )
+        return {debt.id: debt for debt in result.scalars().all()}
+
+    async def get_paid_installments(self, debt_ids: list[str]) -> set[tuple]:
+        result = await self.db.execute(
+            select(DebtPaymentModel.debt_id, DebtPaymentModel.installment_number)
+            .filter(DebtPaymentModel.debt_id.in_(debt_ids))
+            .distinct()
+        )
+        return set(result.tuples().all())
+
+    async def bulk_create_debt_payments(self, debt_payments: list[dict]) -> None:
+        await self.db.execute(insert(DebtPaymentModel).values(debt_payments))
+        await persist(self.db)
+
     # async def update_debt_payment(self, debt_payment: DebtPaymentModel) -> dict:
     #     self.db.add(debt_payment)
     #     self.db.commit()
@@ -1,17 +1,25 @@
-from fastapi import APIRouter, Depends, status
-from src.user.dependencies import auth_dependency
+from fastapi import APIRouter, Depends, Query, status
+from src.user.dependencies import auth_dependency, check_not_modified
 from .dependencies import (
     DebtService,
     DebtPaymentService,
+    DebtSimulationService,
     get_debt_service,
+    get_debt_simulation_service,
     get_debt_payment_service,
 )
 from src.schemas import ResponseNotFound
 from .schemas import (
     DebtResponseSchema,
+    DebtScheduleResponseSchema,
+    PayoffSimulationCreateSchema,
+    PayoffSimulationResponseSchema,
+    PortfolioScheduleResponseSchema,
     DebtCreateSchema,
     DebtPaymentCreateSchema,
+    DebtPaymentBatchCreateSchema,
     DebtPaymentResponseSchema,
+    DebtPaymentsResponseSchema,
 )
 
 DebtRouter = APIRouter()
@@ -30,7 +38,7 @@ async def get_debt(
     return await debt_service.get_debt_by_id(debt_id)
 
 
-@DebtRouter.get("/debts")
+@DebtRouter.get("/debts", dependencies=[Depends(check_not_modified)])
 async def get_debts(
     current_user: auth_dependency,
     debt_service: DebtService = Depends(get_debt_service),
@@ -38,6 +46,51 @@ async def get_debts(
     return await debt_service.get_debts_by_user_id(current_user.id)
 
 
+@DebtRouter.get(
+    "/debt/{debt_id}/schedule",
+    response_model=DebtScheduleResponseSchema,
+    responses={status.HTTP_404_NOT_FOUND: {"model": ResponseNotFound}},
+)
+async def get_debt_schedule(
+    debt_id: str,
+    current_user: auth_dependency,
+    debt_service: DebtService = Depends(get_debt_service),
+):
+    return await debt_service.get_debt_schedule(debt_id, current_user.id)
+
+
+@DebtRouter.get("/debts/due-soon")
+async def get_debts_due_soon(
+    current_user: auth_dependency,
+    days: int = Query(7, ge=1, le=366),
+    debt_service: DebtService = Depends(get_debt_service),
+):
+    return await debt_service.get_debts_due_soon(current_user.id, days)
+
+
+@DebtRouter.get(
+    "/debts/schedule",
+    response_model=PortfolioScheduleResponseSchema,
+    dependencies=[Depends(check_not_modified)],
+)
+async def get_portfolio_schedule(
+    current_user: auth_dependency,
+    debt_service: DebtService = Depends(get_debt_service),
+):
+    return await debt_service.get_portfolio_schedule(current_user.id)
+
+
+@DebtRouter.post(
+    "/debts/payoff-simulation", response_model=PayoffSimulationResponseSchema
+)
+async def simulate_payoff(
+    simulation: PayoffSimulationCreateSchema,
+    current_user: auth_dependency,
+    simulation_service: DebtSimulationService = Depends(get_debt_simulation_service),
+):
+    return await simulation_service.simulate_payoff(current_user.id, simulation)
+
+
 @DebtRouter.post("/debt")
 async def create_debt(
     new_debt: DebtCreateSchema,
@@ -58,6 +111,15 @@ async def create_debt_payment(
     )
 
 
+@DebtRouter.post("/debt-payments/batch", response_model=DebtPaymentsResponseSchema)
+async def create_debt_payments(
+    batch: DebtPaymentBatchCreateSchema,
+    current_user: auth_dependency,
+    debt_payment_service: DebtPaymentService = Depends(get_debt_payment_service),
+):
+    return await debt_payment_service.create_debt_payments(batch, current_user.id)
+
+
 @DebtRouter.get(
     "/debt-payment/{debt_payment_id}",
     response_model=DebtPaymentResponseSchema,
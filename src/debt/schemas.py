@@ -1,8 +1,11 @@
-from datetime import datetime
-from pydantic import BaseModel
-from typing import List, Optional
+from datetime import date, datetime, timezone
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal, Optional
 from .models import DebtStatus, PaymentFrequency
 
+# Payments accepted by one POST /debt-payments/batch request.
+DEBT_PAYMENT_BATCH_SIZE = 1000
+
 
 class DebtCreateSchema(BaseModel):
     creditor: str
@@ -60,13 +63,80 @@ class DebtResponseSchema(BaseModel):
         from_attributes = True
 
 
+class DebtPortfolioSummarySchema(BaseModel):
+    total_outstanding: float
+    weighted_interest_rate: Optional[float]
+    total_paid: float
+
+
 class DebtsResponseSchema(BaseModel):
     debts: List[DebtDetailSchema]
+    summary: Optional[DebtPortfolioSummarySchema] = None
 
     class Config:
         from_attributes = True
 
 
+class InstallmentSchema(BaseModel):
+    installment_number: int
+    due_date: datetime
+    payment: float
+    interest: float
+    principal: float
+    balance: float
+    paid: bool
+
+
+class DebtScheduleSchema(BaseModel):
+    debt_id: str
+    creditor: str
+    amount: float
+    interest_rate: float
+    payment_frequency: Optional[PaymentFrequency]
+    total_interest: float
+    installments: List[InstallmentSchema]
+
+
+class DebtScheduleResponseSchema(BaseModel):
+    schedule: DebtScheduleSchema
+
+
+class PortfolioScheduleResponseSchema(BaseModel):
+    total_amount: float
+    total_interest: float
+    schedules: List[DebtScheduleSchema]
+
+
+PayoffStrategy = Literal["snowball", "avalanche", "custom"]
+
+
+class PayoffSimulationCreateSchema(BaseModel):
+    extra_payment: float = Field(0, ge=0)
+    strategies: List[PayoffStrategy] = Field(["snowball", "avalanche"], min_length=1)
+    custom_order: Optional[List[str]] = None
+
+
+class DebtPayoffSchema(BaseModel):
+    debt_id: str
+    creditor: str
+    balance: float
+    payoff_date: Optional[date]
+    interest: float
+
+
+class PayoffStrategySchema(BaseModel):
+    strategy: PayoffStrategy
+    months: Optional[int]
+    payoff_date: Optional[date]
+    total_interest: float
+    debts: List[DebtPayoffSchema]
+
+
+class PayoffSimulationResponseSchema(BaseModel):
+    monthly_budget: float
+    strategies: List[PayoffStrategySchema]
+
+
 class DebtPaymentCreateSchema(BaseModel):
     debt_id: str
     payment_date: datetime
@@ -78,6 +148,20 @@ class DebtPaymentCreateSchema(BaseModel):
     class Config:
         from_attributes = True
 
+    @field_validator("payment_date")
+    @classmethod
+    def naive_utc(cls, value: datetime) -> datetime:
+        # Stored and compared as naive UTC, like the DateTime columns.
+        if value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class DebtPaymentBatchCreateSchema(BaseModel):
+    debt_payments: List[DebtPaymentCreateSchema] = Field(
+        min_length=1, max_length=DEBT_PAYMENT_BATCH_SIZE
+    )
+
 
 class DebtPaymentResponseSchema(BaseModel):
     debt_payment: DebtPaymentDetailSchema
@@ -1,22 +1,113 @@
-from src.exceptions import NotFoundError
+import asyncio
+import datetime
+from concurrent.futures import Executor
+import numpy as np
+from src.cache import get_response_cache
+from src.config import current_month, generate_uuid
+from src.exceptions import BadRequestError, NotFoundError
+from src.settings import get_settings
+from src.summary.services import SummaryService
 from src.transaction.services import TransactionService
 from src.transaction.schemas import TransactionCreateSchema
+from .amortization import PERIODS_PER_YEAR, amortize, installment_dates, period_rates
+from .models import DebtStatus, PaymentFrequency
 from .repository import DebtRepository, DebtPaymentRepository
+from .simulation import simulate_payoff
 from .schemas import (
     DebtDetailSchema,
     DebtPaymentDetailSchema,
     DebtCreateSchema,
     DebtPaymentCreateSchema,
+    DebtPaymentBatchCreateSchema,
     DebtResponseSchema,
     DebtsResponseSchema,
     DebtPaymentResponseSchema,
     DebtPaymentsResponseSchema,
+    DebtPayoffSchema,
+    PayoffSimulationCreateSchema,
+    PayoffSimulationResponseSchema,
+    PayoffStrategySchema,
+    DebtPortfolioSummarySchema,
+    DebtScheduleSchema,
+    DebtScheduleResponseSchema,
+    InstallmentSchema,
+    PortfolioScheduleResponseSchema,
 )
 
 
+def debt_detail(debt, paid_installments, total_paid) -> DebtDetailSchema:
+    return DebtDetailSchema(
+        id=debt.id,
+        amount=debt.amount,
+        due_date=debt.due_date,
+        minimum_payment=debt.minimum_payment,
+        status=debt.status,
+        creditor=debt.creditor,
+        description=debt.description,
+        installment_count=debt.installment_count,
+        total_paid=total_paid,
+        paid_installments=paid_installments,
+        next_payment_date=debt.next_payment_date,
+        estimated_completion_date=debt.estimated_completion_date,
+        interest_rate=debt.interest_rate,
+        payment_frequency=debt.payment_frequency,
+        debt_payments=[],
+    )
+
+
+def build_schedules(debts: list, paid_counts: list[int]) -> list[DebtScheduleSchema]:
+    """Amortization schedules of ``debts`` computed in one vectorized pass."""
+    if not debts:
+        return []
+    amortization = amortize(
+        [debt.amount for debt in debts],
+        period_rates(
+            [debt.interest_rate or 0 for debt in debts],
+            [debt.payment_frequency for debt in debts],
+        ),
+        [debt.installment_count for debt in debts],
+    )
+    payment = amortization.payment.round(2).tolist()
+    interest = amortization.interest.round(2).tolist()
+    principal = amortization.principal.round(2).tolist()
+    balance = amortization.balance.round(2).tolist()
+    total_interest = amortization.interest.sum(axis=1).round(2).tolist()
+    schedules = []
+    for index, (debt, paid) in enumerate(zip(debts, paid_counts)):
+        count = int(amortization.counts[index])
+        dates = installment_dates(debt.due_date, debt.payment_frequency, count)
+        schedules.append(
+            DebtScheduleSchema(
+                debt_id=debt.id,
+                creditor=debt.creditor,
+                amount=debt.amount,
+                interest_rate=debt.interest_rate or 0,
+                payment_frequency=debt.payment_frequency,
+                total_interest=total_interest[index],
+                installments=[
+                    InstallmentSchema(
+                        installment_number=number + 1,
+                        due_date=dates[number],
+                        payment=payment[index][number],
+                        interest=interest[index][number],
+                        principal=principal[index][number],
+                        balance=balance[index][number],
+                        paid=number < paid,
+                    )
+                    for number in range(count)
+                ],
+            )
+        )
+    return schedules
+
+
 class DebtService:
-    def __init__(self, debt_repository: DebtRepository):
+    def __init__(
+        self, debt_repository: DebtRepository, summary_service: SummaryService
+    ):
         self.debt_repository = debt_repository
+        self.summary_service = summary_service
+        self.response_cache = get_response_cache()
 
     async def get_debt_by_id(self, debt_id: str) -> dict:
         debt = await self.debt_repository.get_debt_by_id(debt_id)
@@ -27,30 +118,58 @@ class DebtService:
     async def get_debts_by_user_id(self, user_id: str) -> dict:
         debts = await self.debt_repository.get_debts_by_user_id(user_id)
         if not debts:
-            return DebtsResponseSchema(debts=[])
+            return DebtsResponseSchema(
+                debts=[],
+                summary=DebtPortfolioSummarySchema(
+                    total_outstanding=0, weighted_interest_rate=None, total_paid=0
+                ),
+            )
         return DebtsResponseSchema(
             debts=[
-                DebtDetailSchema(
-                    id=debt.id,
-                    amount=debt.amount,
-                    due_date=debt.due_date,
-                    minimum_payment=debt.minimum_payment,
-                    status=debt.status,
-                    creditor=debt.creditor,
-                    description=debt.description,
-                    installment_count=debt.installment_count,
-                    total_paid=total_paid,
-                    paid_installments=paid_installments,
-                    next_payment_date=debt.next_payment_date,
-                    estimated_completion_date=debt.estimated_completion_date,
-                    interest_rate=debt.interest_rate,
-                    payment_frequency=debt.payment_frequency,
-                    debt_payments=[],
-                )
-                for debt, paid_installments, total_paid in debts
+                debt_detail(row.DebtModel, row.paid_installments, row.total_paid)
+                for row in debts
+            ],
+            summary=DebtPortfolioSummarySchema(
+                total_outstanding=debts[0].total_outstanding,
+                weighted_interest_rate=debts[0].weighted_interest_rate,
+                total_paid=debts[0].portfolio_paid,
+            ),
+        )
+
+    async def get_debts_due_soon(self, user_id: str, days: int) -> dict:
+        # Payment dates are stored as naive UTC.
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        rows = await self.debt_repository.get_debts_due_before(
+            user_id, now + datetime.timedelta(days=days)
+        )
+        return DebtsResponseSchema(
+            debts=[
+                debt_detail(row.DebtModel, row.paid_installments, row.total_paid)
+                for row in rows
             ]
         )
 
+    async def get_debt_schedule(self, debt_id: str, user_id: str) -> dict:
+        debt = await self.debt_repository.get_debt_by_id(debt_id)
+        if not debt or debt.user_id != user_id:
+            raise NotFoundError("Debt not found")
+        [schedule] = build_schedules([debt], [len(debt.debt_payments)])
+        return DebtScheduleResponseSchema(schedule=schedule)
+
+    async def get_portfolio_schedule(self, user_id: str) -> dict:
+        rows = await self.debt_repository.get_debts_by_user_id(user_id)
+        schedules = build_schedules(
+            [row.DebtModel for row in rows],
+            [row.paid_installments for row in rows],
+        )
+        return PortfolioScheduleResponseSchema(
+            total_amount=sum(schedule.amount for schedule in schedules),
+            total_interest=round(
+                sum(schedule.total_interest for schedule in schedules), 2
+            ),
+            schedules=schedules,
+        )
+
     async def get_debts_by_user_id_and_status(self, user_id: str, status: str) -> dict:
         debts = await self.debt_repository.get_debts_by_user_id_and_status(
             user_id, status
@@ -74,8 +193,120 @@ class DebtService:
         )
 
     async def create_debt(self, new_debt: DebtCreateSchema, user_id: str) -> dict:
-        debt = await self.debt_repository.create_debt(new_debt, user_id)
-        return debt
+        async with self.debt_repository.unit_of_work():
+            debt = await self.debt_repository.create_debt(new_debt, user_id)
+            await self.summary_service.record(user_id, debt=new_debt.amount)
+            # Built before the commit expires the new row.
+            response = DebtResponseSchema(debt=debt_detail(debt, 0, 0))
+        await self.response_cache.invalidate(user_id)
+        return response
+
+
+def add_months(month: datetime.date, months: int) -> datetime.date:
+    year, index = divmod(month.month - 1 + months, 12)
+    return datetime.date(month.year + year, index + 1, 1)
+
+
+class DebtSimulationService:
+    def __init__(self, debt_repository: DebtRepository, executor: Executor):
+        self.debt_repository = debt_repository
+        self.executor = executor
+        self.settings = get_settings()
+
+    def strategy_orders(
+        self, debts: list, balances, rates, simulation: PayoffSimulationCreateSchema
+    ) -> np.ndarray:
+        orders = []
+        for strategy in simulation.strategies:
+            if strategy == "snowball":
+                orders.append(np.lexsort((-rates, balances)))
+            elif strategy == "avalanche":
+                orders.append(np.lexsort((balances, -rates)))
+            else:
+                positions = {debt.id: index for index, debt in enumerate(debts)}
+                custom_order = simulation.custom_order or []
+                unknown = [
+                    debt_id for debt_id in custom_order if debt_id not in positions
+                ]
+                if not simulation.custom_order or unknown:
+                    raise BadRequestError(
+                        "custom_order must list the ids of the user's open debts"
+                    )
+                first = [positions[debt_id] for debt_id in dict.fromkeys(custom_order)]
+                rest = [index for index in range(len(debts)) if index not in first]
+                orders.append(np.array(first + rest))
+        return np.array(orders)
+
+    async def simulate_payoff(
+        self, user_id: str, simulation: PayoffSimulationCreateSchema
+    ) -> dict:
+        rows = await self.debt_repository.get_debts_by_user_id(user_id)
+        open_debts = [
+            (row.DebtModel, row.DebtModel.amount - row.total_paid)
+            for row in rows
+            if row.DebtModel.status != DebtStatus.PAID
+            and row.DebtModel.amount - row.total_paid > 0
+        ]
+        debts = [debt for debt, _ in open_debts]
+        balances = np.array([balance for _, balance in open_debts], dtype=float)
+        rates = np.array([debt.interest_rate or 0 for debt in debts], dtype=float)
+        minimum_payments = np.array(
+            [
+                debt.minimum_payment
+                * PERIODS_PER_YEAR[debt.payment_frequency or PaymentFrequency.MONTHLY]
+                / 12
+                for debt in debts
+            ],
+            dtype=float,
+        )
+        orders = self.strategy_orders(debts, balances, rates, simulation)
+        payoff_months, interest = await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            simulate_payoff,
+            balances,
+            rates / 100 / 12,
+            minimum_payments,
+            simulation.extra_payment,
+            orders,
+            self.settings.SIMULATION_MAX_MONTHS,
+        )
+
+        start = current_month()
+
+        def payoff_date(month: int):
+            return add_months(start, int(month)) if month >= 0 else None
+
+        strategies = []
+        for index, strategy in enumerate(simulation.strategies):
+            months = payoff_months[index]
+            finished = len(debts) == 0 or (months >= 0).all()
+            total_months = int(months.max(initial=0)) if finished else None
+            strategies.append(
+                PayoffStrategySchema(
+                    strategy=strategy,
+                    months=total_months,
+                    payoff_date=(
+                        payoff_date(total_months) if total_months is not None else None
+                    ),
+                    total_interest=round(float(interest[index].sum()), 2),
+                    debts=[
+                        DebtPayoffSchema(
+                            debt_id=debt.id,
+                            creditor=debt.creditor,
+                            balance=balances[position],
+                            payoff_date=payoff_date(months[position]),
+                            interest=round(float(interest[index][position]), 2),
+                        )
+                        for position, debt in enumerate(debts)
+                    ],
+                )
+            )
+        return PayoffSimulationResponseSchema(
+            monthly_budget=round(
+                float(minimum_payments.sum()) + simulation.extra_payment, 2
+            ),
+            strategies=strategies,
+        )
 
 
 class DebtPaymentService:
@@ -83,9 +314,12 @@ class DebtPaymentService:
         self,
         debt_payment_repository: DebtPaymentRepository,
         transaction_service: TransactionService,
+        summary_service: SummaryService,
     ):
         self.debt_payment_repository = debt_payment_repository
         self.transaction_service = transaction_service
+        self.summary_service = summary_service
+        self.response_cache = get_response_cache()
 
     async def get_debt_payment_by_id(self, debt_payment_id: str) -> dict:
         debt_payment = await self.debt_payment_repository.get_debt_payment_by_id(
@@ -117,14 +351,128 @@ class DebtPaymentService:
             amount=debt_payment.amount_paid,
             category="Debt Payment",
             description=debt_payment.description,
-            type="debt",
-        )
-        new_transaction = await self.transaction_service.create_transaction(
-            transaction, user_id
+            type="debt_payment",
         )
-        debt_payment = await self.debt_payment_repository.create_debt_payment(
-            debt_payment, new_transaction.transaction.id
-        )
-        return DebtPaymentResponseSchema(
-            debt_payment=DebtPaymentDetailSchema.model_validate(debt_payment)
+        async with self.debt_payment_repository.unit_of_work():
+            debts = await self.debt_payment_repository.get_user_debts_for_update(
+                user_id, [debt_payment.debt_id]
+            )
+            if debt_payment.debt_id not in debts:
+                raise NotFoundError("Debt not found")
+            new_transaction = await self.transaction_service.create_transaction(
+                transaction, user_id
+            )
+            debt_payment = await self.debt_payment_repository.create_debt_payment(
+                debt_payment,
+                new_transaction.transaction.id,
+                debts[debt_payment.debt_id],
+            )
+            await self.summary_service.record(
+                user_id, debt_payment=debt_payment.amount_paid
+            )
+            response = DebtPaymentResponseSchema(
+                debt_payment=DebtPaymentDetailSchema.model_validate(debt_payment)
+            )
+        await self.response_cache.invalidate(user_id)
+        return response
+
+    def validate_batch(
+        self,
+        debt_payments: list[DebtPaymentCreateSchema],
+        debts: dict,
+        paid_installments: set[tuple],
+    ) -> None:
+        """Check the whole batch before writing anything and report every
+        invalid payment, by index, in one error."""
+        errors = []
+        seen = set()
+        for index, debt_payment in enumerate(debt_payments):
+            installment = (debt_payment.debt_id, debt_payment.installment_number)
+            debt = debts.get(debt_payment.debt_id)
+            # Debts without an installment count take any number.
+            last_installment = (
+                debt.installment_count if debt and debt.installment_count > 0 else None
+            )
+            if debt is None:
+                error = "Debt not found"
+            elif debt_payment.amount_paid <= 0:
+                error = "amount_paid must be positive"
+            elif debt_payment.installment_number < 1 or (
+                last_installment is not None
+                and debt_payment.installment_number > last_installment
+            ):
+                error = "installment_number is out of range"
+            elif installment in seen:
+                error = "Installment repeated in the batch"
+            elif installment in paid_installments:
+                error = "Installment already paid"
+            else:
+                seen.add(installment)
+                continue
+            errors.append({"index": index, "error": error})
+        if errors:
+            raise BadRequestError(errors)
+
+    async def create_debt_payments(
+        self, batch: DebtPaymentBatchCreateSchema, user_id: str
+    ) -> dict:
+        """Import many payments in one database transaction: one INSERT each
+        for transactions, budget links and payments. Each payment is dated,
+        linked to budgets and added to the monthly totals by its
+        ``payment_date``, which is also how ``rebuild_totals`` attributes it."""
+        debt_payments = batch.debt_payments
+        debt_ids = list({debt_payment.debt_id for debt_payment in debt_payments})
+        dates = [debt_payment.payment_date for debt_payment in debt_payments]
+        async with self.debt_payment_repository.unit_of_work():
+            debts = await self.debt_payment_repository.get_user_debts_for_update(
+                user_id, debt_ids
+            )
+            paid_installments = (
+                await self.debt_payment_repository.get_paid_installments(debt_ids)
+            )
+            self.validate_batch(debt_payments, debts, paid_installments)
+            transaction_ids = await self.transaction_service.create_transactions(
+                [
+                    TransactionCreateSchema(
+                        amount=debt_payment.amount_paid,
+                        category="Debt Payment",
+                        description=debt_payment.description,
+                        type="debt_payment",
+                    )
+                    for debt_payment in debt_payments
+                ],
+                dates,
+                user_id,
+            )
+            rows = [
+                {
+                    "id": generate_uuid(),
+                    "debt_id": debt_payment.debt_id,
+                    "transaction_id": transaction_id,
+                    "payment_date": debt_payment.payment_date,
+                    "amount_paid": debt_payment.amount_paid,
+                    "installment_number": debt_payment.installment_number,
+                    "status": debt_payment.status,
+                    "created_at": debt_payment.payment_date,
+                    "updated_at": None,
+                }
+                for debt_payment, transaction_id in zip(debt_payments, transaction_ids)
+            ]
+            await self.debt_payment_repository.bulk_create_debt_payments(rows)
+            monthly_totals = {}
+            for debt_payment in debt_payments:
+                debts[debt_payment.debt_id].record_payment(
+                    debt_payment.payment_date, debt_payment.installment_number
+                )
+                month = debt_payment.payment_date.date().replace(day=1)
+                monthly_totals[month] = (
+                    monthly_totals.get(month, 0) + debt_payment.amount_paid
+                )
+            for month, total in monthly_totals.items():
+                await self.summary_service.record(
+                    user_id, month=month, debt_payment=total
+                )
+        await self.response_cache.invalidate(user_id)
+        return DebtPaymentsResponseSchema(
+            debt_payments=[DebtPaymentDetailSchema.model_validate(row) for row in rows]
         )
@@ -0,0 +1,47 @@
+import numpy as np
+
+# Balances under a cent count as paid off.
+PAID_OFF = 0.005
+
+
+def simulate_payoff(
+    balances: np.ndarray,
+    monthly_rates: np.ndarray,
+    minimum_payments: np.ndarray,
+    extra_payment: float,
+    orders: np.ndarray,
+    max_months: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pay a portfolio down month by month under several strategies at once.
+
+    ``orders`` holds one row per strategy with the debt indexes by priority.
+    Every month interest accrues, each debt gets its minimum payment, and the
+    rest of the fixed budget (all minimums plus ``extra_payment``, so minimums
+    freed by paid-off debts roll over) goes to debts in priority order.
+
+    Returns the payoff month of each debt per strategy (-1 when not paid
+    within ``max_months``) and the interest each debt accrued. Runs in a worker
+    process, so it only depends on NumPy.
+    """
+    strategies = len(orders)
+    balance = np.tile(balances.astype(float), (strategies, 1))
+    budget = minimum_payments.sum() + extra_payment
+    interest = np.zeros_like(balance)
+    payoff_month = np.full(balance.shape, -1)
+    rows = np.arange(strategies)[:, None]
+    for month in range(1, max_months + 1):
+        active = balance > 0
+        if not active.any():
+            break
+        accrued = balance * monthly_rates
+        interest += accrued
+        balance += accrued
+        payment = np.minimum(minimum_payments, balance)
+        balance -= payment
+        leftover = budget - payment.sum(axis=1, keepdims=True)
+        ordered = balance[rows, orders]
+        ahead = np.cumsum(ordered, axis=1) - ordered
+        balance[rows, orders] -= np.clip(leftover - ahead, 0, ordered)
+        balance[balance < PAID_OFF] = 0
+        payoff_month[active & (balance == 0)] = month
+    return payoff_month, interest
@@ -1,6 +1,13 @@
-from fastapi import Depends
+from fastapi import Depends, Request
 from typing import Annotated
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.container import ServiceContainer
 from src.database import get_db
 
-db_dependency = Annotated[Session, Depends(get_db)]
+
+def get_container(request: Request) -> ServiceContainer:
+    return request.app.state.container
+
+
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
+container_dependency = Annotated[ServiceContainer, Depends(get_container)]
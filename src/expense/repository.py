@@ -1,14 +1,16 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database import persist
 from .models import ExpenseModel
 from .schemas import ExpenseCreateSchema
 
 
 class ExpenseRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     async def expense_query(self):
-        return self.db.query(ExpenseModel).filter(ExpenseModel.deleted_at.is_(None))
+        return select(ExpenseModel).filter(ExpenseModel.deleted_at.is_(None))
 
     async def create_expense(self, expense: ExpenseCreateSchema) -> dict:
         new_expense = ExpenseModel(
@@ -17,6 +19,5 @@ class ExpenseRepository:
             description=expense.description,  # TODO: Puede que no lo use
         )
         self.db.add(new_expense)
-        self.db.commit()
-        self.db.refresh(new_expense)
+        await persist(self.db, new_expense)
         return new_expense
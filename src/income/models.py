@@ -10,7 +10,9 @@ class IncomeModel(Base):
     __table_args__ = {"extend_existing": True}
 
     id = Column(String, primary_key=True, index=True, default=generate_uuid)
-    transaction_id = Column(String, ForeignKey("transactions.id"), nullable=False)
+    transaction_id = Column(
+        String, ForeignKey("transactions.id"), nullable=False, index=True
+    )
     amount = Column(Integer, nullable=False, default=0)
     source = Column(String, nullable=True)
     created_at = Column(DateTime, nullable=True)
@@ -1,23 +1,27 @@
 import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database import persist
 from .models import IncomeModel
 from .schemas import IncomeCreateSchema, IncomeDetailSchema
 
 
 class IncomeRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     async def income_query(self):
-        return self.db.query(IncomeModel).filter(IncomeModel.deleted_at.is_(None))
+        return select(IncomeModel).filter(IncomeModel.deleted_at.is_(None))
 
     async def get_incomes(self):
         query = await self.income_query()
-        return query.all()
+        result = await self.db.execute(query)
+        return result.scalars().all()
 
     async def get_income_by_id(self, income_id: str):
         query = await self.income_query()
-        return query.filter(IncomeModel.id == income_id).first()
+        result = await self.db.execute(query.filter(IncomeModel.id == income_id))
+        return result.scalars().first()
 
     async def create_income(self, income: IncomeCreateSchema) -> dict:
         new_income = IncomeModel(
@@ -26,20 +30,21 @@ class IncomeRepository:
             source=income.source,
         )
         self.db.add(new_income)
-        self.db.commit()
-        self.db.refresh(new_income)
+        await persist(self.db, new_income)
         return new_income
 
     async def delete_income(self, income_id: str):
-        self.db.query(IncomeModel).filter(IncomeModel.id == income_id).update(
-            {"deleted_at": datetime.datetime.now(datetime.timezone.utc)}
+        await self.db.execute(
+            update(IncomeModel)
+            .where(IncomeModel.id == income_id)
+            .values(deleted_at=datetime.datetime.now(datetime.timezone.utc))
         )
-        self.db.commit()
+        await self.db.commit()
         return {"message": "Income deleted successfully"}
 
     async def update_income(self, income_id: str, update_data: dict) -> dict:
-        self.db.query(IncomeModel).filter(IncomeModel.id == income_id).update(
-            update_data
+        await self.db.execute(
+            update(IncomeModel).where(IncomeModel.id == income_id).values(update_data)
         )
-        self.db.commit()
+        await self.db.commit()
         return await self.get_income_by_id(income_id)
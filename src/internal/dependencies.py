@@ -0,0 +1,12 @@
+from typing import Optional
+from fastapi import Header
+from src.exceptions import NotFoundError, UnauthorizedError
+from src.settings import get_settings
+
+
+async def verify_internal_key(x_internal_key: Optional[str] = Header(default=None)):
+    settings = get_settings()
+    if not settings.INTERNAL_API_KEY:
+        raise NotFoundError()
+    if x_internal_key != settings.INTERNAL_API_KEY:
+        raise UnauthorizedError("Invalid internal key")
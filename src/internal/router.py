@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+from src.cache import get_response_cache
+from src.database import get_pool_stats
+from src.dependencies import container_dependency
+from .dependencies import verify_internal_key
+
+InternalRouter = APIRouter(dependencies=[Depends(verify_internal_key)])
+
+
+@InternalRouter.get("/internal/pool-stats")
+async def pool_stats():
+    return get_pool_stats()
+
+
+@InternalRouter.get("/internal/cache-stats")
+async def cache_stats():
+    return get_response_cache().snapshot()
+
+
+@InternalRouter.get("/internal/token-cache-stats")
+async def token_cache_stats(container: container_dependency):
+    return container.token_cache.snapshot()
+
+
+@InternalRouter.get("/internal/ai-cache-stats")
+async def ai_cache_stats(container: container_dependency):
+    return container.ai_cache.snapshot()
@@ -1,18 +1,30 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from src.settings import Settings
+from src.container import ServiceContainer
+from src.settings import get_settings
 from src.ai.route import AIRouter
 from src.user.router import AuthRouter
 from src.debt.router import DebtRouter
 from src.transaction.router import TransactionRouter
 from src.budget.router import BudgetRouter
 from src.income.router import IncomeRouter
+from src.internal.router import InternalRouter
+
+settings = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.container = ServiceContainer(settings)
+    yield
+    await app.state.container.close()
 
-settings = Settings()
 
 app = FastAPI(
     title=settings.app_name,
     version=settings.version,
+    lifespan=lifespan,
 )
 
 origins = settings.ALLOWED_HOSTS
@@ -31,3 +43,6 @@ app.include_router(DebtRouter, prefix="/api/v1", tags=["Debts"])
 app.include_router(BudgetRouter, prefix="/api/v1", tags=["Budgets"])
 app.include_router(TransactionRouter, prefix="/api/v1", tags=["Transactions"])
 app.include_router(IncomeRouter, prefix="/api/v1", tags=["Incomes"])
+app.include_router(
+    InternalRouter, prefix="/api/v1", tags=["Internal"], include_in_schema=False
+)
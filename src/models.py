@@ -6,6 +6,7 @@ from src.transaction.models import TransactionModel
 from src.income.models import IncomeModel
 from src.saving.models import SavingModel
 from src.expense.models import ExpenseModel
+from src.summary.models import UserMonthlyTotalModel
 
 metadata = MetaData()
 
@@ -19,6 +20,7 @@ for model in [
     IncomeModel,
     SavingModel,
     ExpenseModel,
+    UserMonthlyTotalModel,
 ]:
     for table in model.metadata.tables.values():
         table.tometadata(metadata)
@@ -0,0 +1,18 @@
+import base64
+import datetime
+import json
+from src.exceptions import BadRequestError
+
+
+def encode_cursor(created_at: datetime.datetime, id: str) -> str:
+    payload = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime.datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.datetime.fromisoformat(created_at), str(id)
+    except (ValueError, TypeError):
+        raise BadRequestError("Invalid cursor")
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -7,6 +8,41 @@ class Settings(BaseSettings):
     version: str = "0.1.0-beta"
     HOST: str
     DATABASE_URL: str
+    DATABASE_ASYNC: bool = False
+    READ_DATABASE_URL: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: int = 5
+    UNIT_OF_WORK: bool = True
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_TIMEOUT: float = 30.0
+    INTERNAL_API_KEY: Optional[str] = None
+    AUTH_VERIFICATION: str = "local"
+    AUTH_REMOTE_FALLBACK: bool = False
+    AUTH_AUDIENCE: Optional[str] = "authenticated"
+    AUTH_JWKS_URL: Optional[str] = None
+    AUTH_JWKS_REFRESH_SECONDS: float = 600
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    AUTH_NEGATIVE_CACHE_SECONDS: float = 10
+    CACHE_BACKEND: str = "memory"
+    CACHE_URL: Optional[str] = None
+    CACHE_TTL_SECONDS: float = 30
+    CACHE_MAX_USERS: int = 10000
+    OPENAI_MODEL: str = "gpt-4o"
+    OPENAI_TIMEOUT_SECONDS: float = 30
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = 5
+    OPENAI_MAX_RETRIES: int = 1
+    AI_SCHEMA_SELECTION: bool = True
+    AI_QUERY_TIMEOUT_MS: int = 5000
+    AI_QUERY_MAX_COST: float = 100000
+    AI_QUERY_MAX_PLAN_ROWS: float = 1000000
+    AI_QUERY_MAX_ROWS: int = 200
+    SIMULATION_WORKERS: int = 2
+    SIMULATION_MAX_MONTHS: int = 600
+    AI_SQL_CACHE_SIZE: int = 1000
+    AI_ROWS_CACHE_SIZE: int = 1000
+    AI_ANSWER_CACHE_SIZE: int = 1000
     ALLOWED_HOSTS: list[str]
     SECRET_KEY: str
     ALGORITHM: str
@@ -0,0 +1,7 @@
+from src.dependencies import db_dependency
+from .services import SummaryService
+from .repository import SummaryRepository
+
+
+def get_summary_service(db: db_dependency) -> SummaryService:
+    return SummaryService(SummaryRepository(db))
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, ForeignKey, Float, String, Date, DateTime
+from src.database import Base
+
+
+class UserMonthlyTotalModel(Base):
+    __tablename__ = "user_monthly_totals"
+    __table_args__ = {"extend_existing": True}
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    month = Column(Date, primary_key=True)
+    income = Column(Float, nullable=False, default=0, server_default="0")
+    expense = Column(Float, nullable=False, default=0, server_default="0")
+    saving = Column(Float, nullable=False, default=0, server_default="0")
+    debt = Column(Float, nullable=False, default=0, server_default="0")
+    debt_payment = Column(Float, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, nullable=True)
@@ -0,0 +1,156 @@
+import datetime
+from sqlalchemy import (
+    Date,
+    cast,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    text,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database import persist
+from src.settings import get_settings
+from src.budget.models import BudgetModel, BudgetTransactionModel
+from src.debt.models import DebtModel, DebtPaymentModel
+from src.expense.models import ExpenseModel
+from src.income.models import IncomeModel
+from src.saving.models import SavingModel
+from src.user.models import UserModel
+from .models import UserMonthlyTotalModel
+
+TOTALS = ["income", "expense", "saving", "debt", "debt_payment"]
+
+
+class SummaryRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def months_query(self, user_id: str, months: list[datetime.date]):
+        return select(UserMonthlyTotalModel).filter(
+            UserMonthlyTotalModel.user_id == user_id,
+            UserMonthlyTotalModel.month.in_(months),
+        )
+
+    async def get_months(self, user_id: str, months: list[datetime.date]) -> dict:
+        result = await self.db.execute(self.months_query(user_id, months))
+        return {total.month: total for total in result.scalars().all()}
+
+    async def add_totals(self, user_id: str, month: datetime.date, **amounts) -> None:
+        table = UserMonthlyTotalModel.__table__
+        statement = pg_insert(table).values(user_id=user_id, month=month, **amounts)
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "month"],
+            set_={
+                **{name: table.c[name] + statement.excluded[name] for name in amounts},
+                "updated_at": datetime.datetime.now(datetime.timezone.utc),
+            },
+        )
+        await self.db.execute(statement)
+        await persist(self.db)
+
+    def totals_source_query(self, user_id: str = None):
+        """One row per (user, month) aggregated from the source tables, with
+        the same attribution the live summary queries used."""
+
+        def month_of(column):
+            return cast(func.date_trunc("month", column), Date)
+
+        def budget_linked(model):
+            return (
+                select(
+                    BudgetModel.user_id.label("user_id"),
+                    month_of(model.created_at).label("month"),
+                    model.amount.label("amount"),
+                )
+                .join(
+                    BudgetTransactionModel,
+                    model.transaction_id == BudgetTransactionModel.transaction_id,
+                )
+                .join(BudgetModel, BudgetTransactionModel.budget_id == BudgetModel.id)
+                .filter(BudgetModel.type == "Balanced")
+            )
+
+        def shaped(query, total):
+            source = query.subquery()
+            return select(
+                source.c.user_id,
+                source.c.month,
+                *[
+                    (source.c.amount if name == total else literal_column("0")).label(
+                        name
+                    )
+                    for name in TOTALS
+                ],
+            )
+
+        rows = union_all(
+            shaped(budget_linked(IncomeModel), "income"),
+            shaped(budget_linked(ExpenseModel), "expense"),
+            shaped(budget_linked(SavingModel), "saving"),
+            shaped(
+                select(
+                    DebtModel.user_id.label("user_id"),
+                    month_of(DebtModel.created_at).label("month"),
+                    DebtModel.amount.label("amount"),
+                ).filter(DebtModel.user_id.is_not(None)),
+                "debt",
+            ),
+            shaped(
+                select(
+                    DebtModel.user_id.label("user_id"),
+                    month_of(DebtPaymentModel.created_at).label("month"),
+                    DebtPaymentModel.amount_paid.label("amount"),
+                )
+                .join(DebtModel, DebtPaymentModel.debt_id == DebtModel.id)
+                .filter(DebtModel.user_id.is_not(None)),
+                "debt_payment",
+            ),
+        ).subquery()
+        query = select(
+            rows.c.user_id,
+            rows.c.month,
+            *[func.sum(rows.c[name]).label(name) for name in TOTALS],
+        ).group_by(rows.c.user_id, rows.c.month)
+        if user_id is not None:
+            query = query.filter(rows.c.user_id == user_id)
+        return query
+
+    async def rebuild_totals(self, user_id: str = None) -> int:
+        """Replace the stored totals in one transaction.
+
+        On PostgreSQL the table is locked first in EXCLUSIVE mode, which
+        conflicts with the row locks of ``add_totals``: writers that already
+        upserted are waited for, later ones wait for the rebuild. Elsewhere
+        run it with writes stopped.
+        """
+        self.db.info["use_primary"] = True
+        if make_url(get_settings().DATABASE_URL).get_backend_name() == "postgresql":
+            await self.db.execute(
+                text(
+                    f"LOCK TABLE {UserMonthlyTotalModel.__tablename__} "
+                    "IN EXCLUSIVE MODE"
+                )
+            )
+        clear = delete(UserMonthlyTotalModel)
+        if user_id is not None:
+            clear = clear.filter(UserMonthlyTotalModel.user_id == user_id)
+        await self.db.execute(clear)
+        # Summaries change under clients holding ETags; move their versions.
+        users = UserModel.__table__
+        bump = update(users).values(data_version=users.c.data_version + 1)
+        if user_id is not None:
+            bump = bump.where(users.c.id == user_id)
+        await self.db.execute(bump)
+        result = await self.db.execute(
+            insert(UserMonthlyTotalModel).from_select(
+                ["user_id", "month", *TOTALS], self.totals_source_query(user_id)
+            )
+        )
+        await self.db.commit()
+        return result.rowcount
@@ -0,0 +1,29 @@
+import datetime
+from typing import Optional
+from src.config import current_month
+from .repository import SummaryRepository
+
+
+class SummaryService:
+    def __init__(self, summary_repository: SummaryRepository):
+        self.summary_repository = summary_repository
+
+    async def record(
+        self,
+        user_id: str,
+        month: Optional[datetime.date] = None,
+        **amounts: Optional[float],
+    ) -> None:
+        """Add amounts to the user's running totals for ``month``, the
+        current month by default. Runs inside the caller's unit of work."""
+        amounts = {name: amount for name, amount in amounts.items() if amount}
+        if amounts:
+            await self.summary_repository.add_totals(
+                user_id, month or current_month(), **amounts
+            )
+
+    async def get_current_and_previous(self, user_id: str) -> tuple:
+        month = current_month()
+        previous = (month - datetime.timedelta(days=1)).replace(day=1)
+        totals = await self.summary_repository.get_months(user_id, [month, previous])
+        return totals.get(month), totals.get(previous)
@@ -2,6 +2,7 @@ from src.dependencies import db_dependency
 from src.budget.dependencies import BudgetService, BudgetRepository
 from src.income.services import IncomeService, IncomeRepository
 from src.expense.services import ExpenseService, ExpenseRepository
+from src.summary.dependencies import SummaryService, SummaryRepository
 from .repository import TransactionRepository
 from .services import TransactionService
 
@@ -12,4 +13,5 @@ def get_transaction_service(db: db_dependency) -> TransactionService:
         BudgetService(BudgetRepository(db)),
         IncomeService(IncomeRepository(db)),
         ExpenseService(ExpenseRepository(db)),
+        SummaryService(SummaryRepository(db)),
     )
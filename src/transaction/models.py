@@ -1,5 +1,5 @@
 import datetime
-from sqlalchemy import Column, ForeignKey, String, Text, DateTime, event
+from sqlalchemy import Column, ForeignKey, String, Text, DateTime, Index, event
 from sqlalchemy.orm import relationship
 from src.config import generate_uuid
 from src.database import Base
@@ -9,16 +9,34 @@ from src.saving.models import SavingModel
 from src.expense.models import ExpenseModel
 
 
+TRANSACTION_KINDS = ("income", "expense", "saving", "debt_payment")
+
+# Type labels the API returns for each kind.
+KIND_LABELS = {
+    "income": "Income",
+    "saving": "Saving",
+    "expense": "Expense",
+    "debt_payment": "DebtPayment",
+}
+
+
 class TransactionModel(Base):
     __tablename__ = "transactions"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_transactions_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_transactions_kind_created_at", "kind", "created_at"),
+        {"extend_existing": True},
+    )
 
     id = Column(String, primary_key=True, index=True, default=generate_uuid)
+    # Denormalized from the budget links so pages scan only the user's rows.
+    user_id = Column(String, ForeignKey("users.id"), nullable=True)
     description = Column(Text, nullable=True)
-    created_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False)
     updated_at = Column(DateTime, nullable=True)
     deleted_at = Column(DateTime, nullable=True)
     category = Column(String, nullable=False)
+    kind = Column(String, nullable=True)
 
     budget_transaction = relationship(
         "BudgetTransactionModel", back_populates="transaction"
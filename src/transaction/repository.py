@@ -1,165 +1,105 @@
-from sqlalchemy import select, case, func, text
-from sqlalchemy.orm import aliased, contains_eager, joinedload, Session
-from src.budget.models import BudgetModel, BudgetTransactionModel
-from src.debt.models import DebtPaymentModel, DebtModel
-from src.income.models import IncomeModel
-from src.saving.models import SavingModel
-from src.expense.models import ExpenseModel
-from .models import TransactionModel
+import datetime
+from typing import Optional
+from sqlalchemy import select, case, insert, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload
+from src.database import UnitOfWork, persist
+from src.budget.models import BudgetTransactionModel
+from src.debt.models import DebtPaymentModel
+from .models import KIND_LABELS, TransactionModel
 from .schemas import TransactionCreateSchema
 
 
 class TransactionRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
+    def unit_of_work(self) -> UnitOfWork:
+        return UnitOfWork(self.db)
+
     async def get_transaction_by_id(self, transaction_id: str):
-        return (
-            self.db.query(TransactionModel)
-            .filter(TransactionModel.id == transaction_id)
-            .first()
+        result = await self.db.execute(
+            select(TransactionModel).filter(TransactionModel.id == transaction_id)
         )
-
-    async def get_transactions_by_user_id(self, user_id: str):
-        IncomeAlias = aliased(IncomeModel)
-        SavingAlias = aliased(SavingModel)
-        ExpenseAlias = aliased(ExpenseModel)
-        DebtPaymentAlias = aliased(DebtPaymentModel)
-
-        transaction_type_case = case(
-            (IncomeAlias.id != None, "Income"),
-            (SavingAlias.id != None, "Saving"),
-            (ExpenseAlias.id != None, "Expense"),
-            (DebtPaymentAlias.id != None, "DebtPayment"),
-            else_="Otro",
+        return result.scalars().first()
+
+    def transactions_query(
+        self,
+        user_id: str,
+        cursor: Optional[tuple[datetime.datetime, str]] = None,
+        start_date: Optional[datetime.date] = None,
+        end_date: Optional[datetime.date] = None,
+        type: Optional[str] = None,
+    ):
+        # Every transaction is linked to each of the user's month budgets;
+        # the amount is read from any one link.
+        amount = (
+            select(BudgetTransactionModel.amount)
+            .filter(BudgetTransactionModel.transaction_id == TransactionModel.id)
+            .limit(1)
+            .scalar_subquery()
         )
 
-        query = (
-            self.db.query(
-                TransactionModel,
-                BudgetTransactionModel.amount,
-                transaction_type_case.label("transaction_type"),
+        query = select(
+            TransactionModel.id,
+            TransactionModel.created_at,
+            TransactionModel.description,
+            TransactionModel.category,
+            amount.label("amount"),
+            case(KIND_LABELS, value=TransactionModel.kind, else_="Otro").label(
+                "transaction_type"
+            ),
+        ).filter(TransactionModel.user_id == user_id)
+        if cursor is not None:
+            query = query.filter(
+                tuple_(TransactionModel.created_at, TransactionModel.id) < cursor
             )
-            .join(
-                BudgetTransactionModel,
-                TransactionModel.id == BudgetTransactionModel.transaction_id,
-            )
-            .join(BudgetModel, BudgetTransactionModel.budget_id == BudgetModel.id)
-            .outerjoin(IncomeAlias, TransactionModel.id == IncomeAlias.transaction_id)
-            .outerjoin(SavingAlias, TransactionModel.id == SavingAlias.transaction_id)
-            .outerjoin(ExpenseAlias, TransactionModel.id == ExpenseAlias.transaction_id)
-            .outerjoin(
-                DebtPaymentAlias, TransactionModel.id == DebtPaymentAlias.transaction_id
+        if start_date is not None:
+            query = query.filter(TransactionModel.created_at >= start_date)
+        if end_date is not None:
+            query = query.filter(
+                TransactionModel.created_at < end_date + datetime.timedelta(days=1)
             )
-            .filter(BudgetModel.user_id == user_id)
-            .options(contains_eager(TransactionModel.budget_transaction))
-            .order_by(TransactionModel.created_at.desc())
+        if type is not None:
+            query = query.filter(TransactionModel.kind == type)
+        return query.order_by(
+            TransactionModel.created_at.desc(), TransactionModel.id.desc()
         )
 
-        return query.all()
-
-    async def get_summary_by_user_id(self, user_id: str):
-        current_month = func.date_trunc("month", func.now())
-
-        previous_month = func.date_trunc(
-            "month", func.now() - text("INTERVAL '1 month'")
-        )
-        income_query = (
-            self.db.query(
-                func.sum(
-                    case(
-                        (IncomeModel.created_at >= current_month, IncomeModel.amount),
-                        else_=0,
-                    )
-                ).label("current_month_income"),
-                func.sum(
-                    case(
-                        (
-                            (IncomeModel.created_at >= previous_month)
-                            & (IncomeModel.created_at < current_month),
-                            IncomeModel.amount,
-                        ),
-                        else_=0,
-                    )
-                ).label("previous_month_income"),
-            )
-            .join(TransactionModel, IncomeModel.transaction_id == TransactionModel.id)
-            .join(
-                BudgetTransactionModel,
-                TransactionModel.id == BudgetTransactionModel.transaction_id,
-            )
-            .join(BudgetModel, BudgetTransactionModel.budget_id == BudgetModel.id)
-            .filter(BudgetModel.user_id == user_id, BudgetModel.type == "Balanced")
+    async def get_transactions_page(self, user_id: str, limit: int, **filters):
+        result = await self.db.execute(
+            self.transactions_query(user_id, **filters).limit(limit)
         )
+        return result.all()
 
-        expense_query = (
-            self.db.query(
-                func.sum(
-                    case(
-                        (
-                            ExpenseModel.created_at >= current_month,
-                            ExpenseModel.amount,
-                        ),
-                        else_=0,
-                    )
-                ).label("current_month_expense"),
-                func.sum(
-                    case(
-                        (
-                            (ExpenseModel.created_at >= previous_month)
-                            & (ExpenseModel.created_at < current_month),
-                            ExpenseModel.amount,
-                        ),
-                        else_=0,
-                    )
-                ).label("previous_month_expense"),
-            )
-            .join(TransactionModel, ExpenseModel.transaction_id == TransactionModel.id)
-            .join(
-                BudgetTransactionModel,
-                TransactionModel.id == BudgetTransactionModel.transaction_id,
+    async def stream_transactions(self, user_id: str, batch_size: int, **filters):
+        result = await self.db.stream(
+            self.transactions_query(user_id, **filters).execution_options(
+                yield_per=batch_size
             )
-            .join(BudgetModel, BudgetTransactionModel.budget_id == BudgetModel.id)
-            .filter(BudgetModel.user_id == user_id, BudgetModel.type == "Balanced")
         )
+        async for rows in result.partitions():
+            yield rows
 
-        debt_query = select(
-            func.sum(
-                case(
-                    (
-                        DebtModel.created_at >= current_month,
-                        DebtModel.amount,
-                    ),
-                    else_=0,
-                )
-            ).label("current_month_debt"),
-            func.sum(
-                case(
-                    (
-                        (DebtModel.created_at >= previous_month)
-                        & (DebtModel.created_at < current_month),
-                        DebtModel.amount,
-                    ),
-                    else_=0,
-                )
-            ).label("previous_month_debt"),
-        ).filter(DebtModel.user_id == user_id)
-
-        income = income_query.first()
-        expense = expense_query.first()
-        debt = self.db.execute(debt_query).first()
-        return income, expense, debt
-
-    async def create_transaction(self, transaction: TransactionCreateSchema):
+    async def create_transaction(
+        self, transaction: TransactionCreateSchema, user_id: str
+    ):
         new_transaction = TransactionModel(
+            user_id=user_id,
             description=transaction.description,
             category=transaction.category,
+            kind=transaction.type,
         )
         self.db.add(new_transaction)
-        self.db.commit()
-        self.db.refresh(new_transaction)
+        await persist(self.db, new_transaction)
         return new_transaction
 
+    async def bulk_create_transactions(self, transactions: list[dict]) -> None:
+        if not transactions:
+            return
+        await self.db.execute(insert(TransactionModel).values(transactions))
+        await persist(self.db)
+
     async def get_transactions_with_type(self, budget_id: str):
         DebtPaymentAlias = aliased(DebtPaymentModel)
 
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Depends, status
-from src.user.dependencies import auth_dependency
+import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+from src.database import bind_session_user, open_session
+from src.user.dependencies import auth_dependency, check_not_modified
 from .dependencies import TransactionService, get_transaction_service
 from src.schemas import ResponseNotFound
-from .schemas import TransactionResponseSchema, TransactionCreateSchema
+from .schemas import (
+    TransactionResponseSchema,
+    TransactionsResponseSchema,
+    TransactionCreateSchema,
+)
 
 TransactionRouter = APIRouter()
 
@@ -20,15 +28,67 @@ async def get_transaction(
     return await transaction_service.get_transaction_by_id(transaction_id)
 
 
-@TransactionRouter.get("/transactions")
+@TransactionRouter.get(
+    "/transactions",
+    response_model=TransactionsResponseSchema,
+    dependencies=[Depends(check_not_modified)],
+)
 async def get_transactions(
     current_user: auth_dependency,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    start_date: Optional[datetime.date] = None,
+    end_date: Optional[datetime.date] = None,
+    type: Optional[str] = None,
+    transaction_service: TransactionService = Depends(get_transaction_service),
+):
+    return await transaction_service.get_transactions_page(
+        current_user.id,
+        limit,
+        cursor=cursor,
+        start_date=start_date,
+        end_date=end_date,
+        type=type,
+    )
+
+
+@TransactionRouter.get("/transactions/export")
+async def export_transactions(
+    current_user: auth_dependency,
+    format: str = "ndjson",
+    start_date: Optional[datetime.date] = None,
+    end_date: Optional[datetime.date] = None,
+    type: Optional[str] = None,
     transaction_service: TransactionService = Depends(get_transaction_service),
 ):
-    return await transaction_service.get_transactions_by_user_id(current_user.id)
+    media_type = transaction_service.validate_export(format, type)
+    user_id = current_user.id
+
+    # The request session is closed before the body is sent, so the stream
+    # reads through a session of its own.
+    async def content():
+        async with open_session() as db:
+            bind_session_user(db, user_id)
+            service = get_transaction_service(db)
+            async for chunk in service.export_transactions(
+                user_id,
+                format,
+                start_date=start_date,
+                end_date=end_date,
+                type=type,
+            ):
+                yield chunk
+
+    return StreamingResponse(
+        content(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="transactions.{format}"'
+        },
+    )
 
 
-@TransactionRouter.get("/summary")
+@TransactionRouter.get("/summary", dependencies=[Depends(check_not_modified)])
 async def get_summary(
     current_user: auth_dependency,
     transaction_service: TransactionService = Depends(get_transaction_service),
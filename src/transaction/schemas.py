@@ -32,6 +32,7 @@ class TransactionResponseSchema(BaseModel):
 
 class TransactionsResponseSchema(BaseModel):
     transactions: List[TransactionDetailSchema]
+    next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -1,10 +1,20 @@
+import csv
+import datetime
+import io
+import json
+from typing import AsyncIterator, Optional
+from src.cache import get_response_cache
+from src.config import current_month, generate_uuid
 from src.exceptions import BadRequestError, NotFoundError
+from src.pagination import decode_cursor, encode_cursor
 from src.budget.services import BudgetService
 from src.budget.schemas import BudgetTransactionCreateSchema
 from src.income.services import IncomeService
 from src.income.schemas import IncomeCreateSchema
 from src.expense.services import ExpenseService
 from src.expense.schemas import ExpenseCreateSchema
+from src.summary.services import SummaryService
+from .models import TRANSACTION_KINDS
 from .repository import TransactionRepository
 from .schemas import (
     TransactionCreateSchema,
@@ -15,6 +25,10 @@ from .schemas import (
     ValueSchema,
 )
 
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_FIELDS = ["id", "created_at", "description", "category", "amount", "type"]
+EXPORT_BATCH_SIZE = 1000
+
 
 class TransactionService:
     def __init__(
@@ -23,11 +37,14 @@ class TransactionService:
         budget_service: BudgetService,
         income_service: IncomeService,
         expense_service: ExpenseService,
+        summary_service: SummaryService,
     ):
         self.transaction_repository = transaction_repository
         self.budget_service = budget_service
         self.income_service = income_service
         self.expense_service = expense_service
+        self.summary_service = summary_service
+        self.response_cache = get_response_cache()
 
     async def get_transaction_by_id(self, transaction_id: str) -> dict:
         transaction = await self.transaction_repository.get_transaction_by_id(
@@ -39,12 +56,30 @@ class TransactionService:
             transaction=TransactionDetailSchema.model_validate(transaction)
         )
 
-    async def get_transactions_by_user_id(self, user_id: str) -> dict:
-        transactions = await self.transaction_repository.get_transactions_by_user_id(
-            user_id
+    async def get_transactions_page(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        start_date: Optional[datetime.date] = None,
+        end_date: Optional[datetime.date] = None,
+        type: Optional[str] = None,
+    ) -> dict:
+        if type is not None and type not in TRANSACTION_KINDS:
+            raise BadRequestError("Invalid transaction type")
+        transactions = await self.transaction_repository.get_transactions_page(
+            user_id,
+            limit + 1,
+            cursor=decode_cursor(cursor) if cursor else None,
+            start_date=start_date,
+            end_date=end_date,
+            type=type,
         )
-        if not transactions:
-            return TransactionsResponseSchema(transactions=[])
+        next_cursor = None
+        if len(transactions) > limit:
+            transactions = transactions[:limit]
+            last = transactions[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
 
         return TransactionsResponseSchema(
             transactions=[
@@ -53,147 +88,193 @@ class TransactionService:
                     created_at=transaction.created_at,
                     description=transaction.description,
                     category=transaction.category,
-                    amount=amount,
-                    type=transaction_type,
+                    amount=transaction.amount,
+                    type=transaction.transaction_type,
                 )
-                for transaction, amount, transaction_type in transactions
-            ]
+                for transaction in transactions
+            ],
+            next_cursor=next_cursor,
         )
 
+    def validate_export(self, format: str, type: Optional[str] = None) -> str:
+        if format not in EXPORT_FORMATS:
+            raise BadRequestError("Invalid export format")
+        if type is not None and type not in TRANSACTION_KINDS:
+            raise BadRequestError("Invalid transaction type")
+        return EXPORT_FORMATS[format]
+
+    async def export_transactions(
+        self, user_id: str, format: str, **filters
+    ) -> AsyncIterator[str]:
+        """Yield the user's transactions as NDJSON or CSV, one chunk per batch
+        read from a server-side cursor."""
+        if format == "csv":
+            yield ",".join(EXPORT_FIELDS) + "\r\n"
+        async for rows in self.transaction_repository.stream_transactions(
+            user_id, EXPORT_BATCH_SIZE, **filters
+        ):
+            records = [
+                (
+                    row.id,
+                    row.created_at.isoformat() if row.created_at else None,
+                    row.description,
+                    row.category,
+                    row.amount,
+                    row.transaction_type,
+                )
+                for row in rows
+            ]
+            if format == "csv":
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(records)
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(EXPORT_FIELDS, record))) + "\n"
+                    for record in records
+                )
+
     async def get_summary_by_user_id(self, user_id: str) -> dict:
-        income, expense, debt = (
-            await self.transaction_repository.get_summary_by_user_id(user_id)
+        return await self.response_cache.get_or_load(
+            user_id,
+            f"summary:{current_month()}",
+            SummaryResponseSchema,
+            lambda: self.load_summary(user_id),
+            db=self.transaction_repository.db,
         )
-        if not income and not expense and not debt:
-            return SummaryResponseSchema(
-                income=ValueSchema(current_month=0, previous_month=0),
-                expense=ValueSchema(current_month=0, previous_month=0),
-                saving=ValueSchema(current_month=0, previous_month=0),
-                debt=ValueSchema(current_month=0, previous_month=0),
+
+    async def load_summary(self, user_id: str) -> dict:
+        current, previous = await self.summary_service.get_current_and_previous(user_id)
+
+        def value(total: str) -> ValueSchema:
+            current_month = getattr(current, total, 0) or 0
+            previous_month = getattr(previous, total, 0) or 0
+            growth = (
+                ((current_month - previous_month) / previous_month) * 100
+                if previous_month > 0
+                else 0
+            )
+            return ValueSchema(
+                current_month=current_month,
+                previous_month=previous_month,
+                growth=growth,
             )
 
-        current_month_income = income.current_month_income or 0
-        previous_month_income = income.previous_month_income or 0
-        growth_income = (
-            ((current_month_income - previous_month_income) / previous_month_income)
-            * 100
-            if previous_month_income > 0
-            else 0
-        )
-        current_month_expense = expense.current_month_expense or 0
-        previous_month_expense = expense.previous_month_expense or 0
-        growth_expense = (
-            ((current_month_expense - previous_month_expense) / previous_month_expense)
-            * 100
-            if previous_month_expense > 0
-            else 0
-        )
-        current_month_debt = debt.current_month_debt or 0
-        previous_month_debt = debt.previous_month_debt or 0
-        growth_debt = (
-            ((current_month_debt - previous_month_debt) / previous_month_debt) * 100
-            if previous_month_debt > 0
-            else 0
-        )
-        current_month_saving = 0
-        previous_month_saving = 0
         return SummaryResponseSchema(
-            income=ValueSchema(
-                current_month=current_month_income,
-                previous_month=previous_month_income,
-                growth=growth_income,
-            ),
-            expense=ValueSchema(
-                current_month=current_month_expense,
-                previous_month=previous_month_expense,
-                growth=growth_expense,
-            ),
-            saving=ValueSchema(current_month=0, previous_month=0),
-            debt=ValueSchema(
-                current_month=current_month_debt,
-                previous_month=previous_month_debt,
-                growth=growth_debt,
-            ),
+            income=value("income"),
+            expense=value("expense"),
+            saving=value("saving"),
+            debt=value("debt"),
         )
 
     async def create_transaction(
         self, transaction: TransactionCreateSchema, user_id: str
     ) -> dict:
-        budgets_this_month = await self.budget_service.count_budgets_in_date_range(
-            user_id
-        )
-        budgets = []
-        if len(budgets_this_month) < 3:
-            new_budgets = await self.budget_service.auto_create_budget(user_id)
-            budgets = new_budgets["budgets"]
-        else:
-            budgets = budgets_this_month
-        new_transaction = await self.transaction_repository.create_transaction(
-            transaction
-        )
-        budget_transaction = [
-            BudgetTransactionCreateSchema(
-                budget_id=budget.id,
-                transaction_id=new_transaction.id,
-                amount=transaction.amount,
+        async with self.transaction_repository.unit_of_work():
+            budget_ids = await self.budget_service.get_month_budget_ids(user_id)
+            new_transaction = await self.transaction_repository.create_transaction(
+                transaction, user_id
+            )
+            budget_transaction = [
+                BudgetTransactionCreateSchema(
+                    budget_id=budget_id,
+                    transaction_id=new_transaction.id,
+                    amount=transaction.amount,
+                )
+                for budget_id in budget_ids
+            ]
+            await self.budget_service.create_budget_transactions(budget_transaction)
+            response = TransactionResponseSchema(
+                transaction=TransactionDetailSchema.model_validate(new_transaction)
             )
-            for budget in budgets
+        await self.response_cache.invalidate(user_id)
+        return response
+
+    async def create_transactions(
+        self,
+        transactions: list[TransactionCreateSchema],
+        dates: list[datetime.datetime],
+        user_id: str,
+    ) -> list[str]:
+        """Insert many transactions, each dated by ``dates`` and linked to the
+        budgets of that month, with one INSERT per table. Runs inside the
+        caller's unit of work; the caller invalidates caches."""
+        months = [date.date().replace(day=1) for date in dates]
+        budget_ids = await self.budget_service.get_budget_ids_by_month(
+            user_id, set(months)
+        )
+        rows = [
+            {
+                "id": generate_uuid(),
+                "user_id": user_id,
+                "description": transaction.description,
+                "category": transaction.category,
+                "kind": transaction.type,
+                "created_at": date,
+            }
+            for transaction, date in zip(transactions, dates)
         ]
-        for budget in budget_transaction:
-            await self.budget_service.create_budget_transaction(budget)
-        return TransactionResponseSchema(
-            transaction=TransactionDetailSchema.model_validate(new_transaction)
+        await self.transaction_repository.bulk_create_transactions(rows)
+        await self.budget_service.create_budget_transactions(
+            [
+                BudgetTransactionCreateSchema(
+                    budget_id=budget_id,
+                    transaction_id=row["id"],
+                    amount=transaction.amount,
+                )
+                for row, transaction, month in zip(rows, transactions, months)
+                for budget_id in budget_ids[month]
+            ]
         )
+        return [row["id"] for row in rows]
 
     async def create_transaction_v2(
         self, transaction: TransactionCreateSchema, user_id: str
     ) -> dict:
-        budgets_this_month = await self.budget_service.count_budgets_in_date_range(
-            user_id
-        )
-        budgets = []
-        if len(budgets_this_month) < 3:
-            new_budgets = await self.budget_service.auto_create_budget(user_id)
-            budgets = new_budgets["budgets"]
-        else:
-            budgets = budgets_this_month
-
-        data_transaction = TransactionCreateSchema(
-            amount=transaction.amount,
-            description=transaction.description,
-            category=transaction.category,
-        )
-        new_transaction = await self.transaction_repository.create_transaction(
-            data_transaction
-        )
+        if transaction.type not in ("income", "expense"):
+            raise BadRequestError("Invalid transaction type")
 
-        if transaction.type == "income":
-            income = IncomeCreateSchema(
-                transaction_id=new_transaction.id,
-                amount=transaction.amount,
-            )
-            await self.income_service.create_income(income)
-        elif transaction.type == "expense":
-            expense = ExpenseCreateSchema(
-                transaction_id=new_transaction.id,
+        async with self.transaction_repository.unit_of_work():
+            budget_ids = await self.budget_service.get_month_budget_ids(user_id)
+
+            data_transaction = TransactionCreateSchema(
                 amount=transaction.amount,
                 description=transaction.description,
+                category=transaction.category,
+                type=transaction.type,
             )
-            await self.expense_service.create_expense(expense)
-        else:
-            raise BadRequestError("Invalid transaction type")
-
-        budget_transaction = [
-            BudgetTransactionCreateSchema(
-                budget_id=budget.id,
-                transaction_id=new_transaction.id,
-                amount=transaction.amount,
+            new_transaction = await self.transaction_repository.create_transaction(
+                data_transaction, user_id
             )
-            for budget in budgets
-        ]
-        for budget in budget_transaction:
-            await self.budget_service.create_budget_transaction(budget)
 
-        return TransactionResponseSchema(
-            transaction=TransactionDetailSchema.model_validate(new_transaction)
-        )
+            if transaction.type == "income":
+                income = IncomeCreateSchema(
+                    transaction_id=new_transaction.id,
+                    amount=transaction.amount,
+                )
+                await self.income_service.create_income(income)
+                await self.summary_service.record(user_id, income=transaction.amount)
+            else:
+                expense = ExpenseCreateSchema(
+                    transaction_id=new_transaction.id,
+                    amount=transaction.amount,
+                    description=transaction.description,
+                )
+                await self.expense_service.create_expense(expense)
+                await self.summary_service.record(user_id, expense=transaction.amount)
+
+            budget_transaction = [
+                BudgetTransactionCreateSchema(
+                    budget_id=budget_id,
+                    transaction_id=new_transaction.id,
+                    amount=transaction.amount,
+                )
+                for budget_id in budget_ids
+            ]
+            await self.budget_service.create_budget_transactions(budget_transaction)
+
+            response = TransactionResponseSchema(
+                transaction=TransactionDetailSchema.model_validate(new_transaction)
+            )
+        await self.response_cache.invalidate(user_id)
+        return response
@@ -1,7 +1,8 @@
-from fastapi import Depends
+from fastapi import Depends, HTTPException, Request, Response, status
 from typing import Annotated
-from src.dependencies import db_dependency
-from src.config import oauth2_scheme
+from src.dependencies import container_dependency, db_dependency
+from src.config import current_month, oauth2_scheme
+from src.database import bind_session_user
 from .repository import UserRepository
 from .services import UserService, AuthService
 
@@ -10,18 +11,41 @@ def get_user_service(db: db_dependency):
     return UserService(UserRepository(db))
 
 
-def get_auth_service(
-    db: db_dependency,
-):
-    user_service = UserService(UserRepository(db))
-    return AuthService(user_service=user_service)
+def get_auth_service(db: db_dependency, container: container_dependency):
+    return AuthService(UserService(UserRepository(db)), container)
 
 
 async def get_current_user(
+    db: db_dependency,
     auth_service: AuthService = Depends(get_auth_service),
     token: str = Depends(oauth2_scheme),
 ):
-    return await auth_service.get_current_user(token)
+    user = await auth_service.authenticate(token)
+    bind_session_user(db, user.id)
+    return user
 
 
 auth_dependency = Annotated[dict, Depends(get_current_user)]
+
+
+async def check_not_modified(
+    request: Request,
+    response: Response,
+    db: db_dependency,
+    current_user: auth_dependency,
+):
+    """Answer 304 when the client already holds the user's current data.
+
+    The ETag is the user's data version (bumped by every committed write)
+    plus the month, since month-scoped views change when it rolls over.
+    """
+    version = await UserRepository(db).get_data_version(current_user.id)
+    if version is None:
+        return
+    etag = f'W/"{version}-{current_month():%Y%m}"'
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
@@ -1,7 +1,7 @@
 import datetime
-from sqlalchemy import Column, String, DateTime, event
+from sqlalchemy import BigInteger, Column, String, DateTime, event, update
 from sqlalchemy.orm import relationship
-from src.database import Base
+from src.database import Base, RoutingSession
 
 
 class UserModel(Base):
@@ -15,6 +15,7 @@ class UserModel(Base):
     image = Column(String, nullable=True)
     created_at = Column(DateTime, nullable=True)
     deleted_at = Column(DateTime, nullable=True)
+    data_version = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     budgets = relationship("BudgetModel", back_populates="user")
     debts = relationship("DebtModel", back_populates="user")
@@ -23,3 +24,25 @@ class UserModel(Base):
 @event.listens_for(UserModel, "before_insert")
 def set_created_at(mapper, connection, target):
     target.created_at = datetime.datetime.now(datetime.timezone.utc)
+
+
+@event.listens_for(RoutingSession, "before_commit")
+def bump_data_version(session):
+    """Bump the request user's data version in the same transaction as any
+    write, so list ETags change exactly when committed data does."""
+    user_id = session.info.get("user_id")
+    if not user_id:
+        return
+    if not (
+        session.info.get("uncommitted_write")
+        or session.new
+        or session.dirty
+        or session.deleted
+    ):
+        return
+    users = UserModel.__table__
+    session.execute(
+        update(users)
+        .where(users.c.id == user_id)
+        .values(data_version=users.c.data_version + 1)
+    )
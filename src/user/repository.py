@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.settings import get_settings
 from .models import UserModel
 from .schemas import UserCreateSchema
@@ -6,15 +7,19 @@ from .schemas import UserCreateSchema
 
 class UserRepository:
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.settings = get_settings()
 
     async def get_user_by_id(self, user_id: str) -> dict:
-        return self.db.query(UserModel).filter(UserModel.id == user_id).first()
+        result = await self.db.execute(select(UserModel).filter(UserModel.id == user_id))
+        return result.scalars().first()
 
     async def get_user_by_email(self, email: str) -> dict:
-        return self.db.query(UserModel).filter(UserModel.email == email).first()
+        result = await self.db.execute(
+            select(UserModel).filter(UserModel.email == email)
+        )
+        return result.scalars().first()
 
     async def create_user(self, user: UserCreateSchema) -> dict:
         exist_user = await self.get_user_by_email(user.email)
@@ -26,17 +31,22 @@ class UserRepository:
                 image=user.image,
             )
             self.db.add(new_user)
-            self.db.commit()
-            self.db.refresh(new_user)
+            await self.db.commit()
+            await self.db.refresh(new_user)
             return new_user
         return None
 
     async def update_user(self, user: UserModel) -> dict:
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
         return user
 
+    async def get_data_version(self, user_id: str):
+        return await self.db.scalar(
+            select(UserModel.data_version).filter(UserModel.id == user_id)
+        )
+
     async def user_exists(self, email: str) -> bool:
         user = await self.get_user_by_email(email)
         return user is not None
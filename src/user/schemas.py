@@ -45,3 +45,10 @@ class SignOutSchema(BaseModel):
 
 class VerifyTokenSchema(BaseModel):
     token: str
+
+
+class TokenUserSchema(BaseModel):
+    id: str
+    email: Optional[str] = None
+    role: Optional[str] = None
+    exp: Optional[int] = None
@@ -1,15 +1,16 @@
 from fastapi import Request, HTTPException, Depends, status
-from supabase import create_client
 from src.config import oauth2_scheme
-from src.settings import get_settings
+from src.container import ServiceContainer
 from .repository import UserRepository
 from .schemas import (
     UserCreateSchema,
     UserSignInSchema,
     SignInResponseSchema,
     RefreshSessionSchema,
+    TokenUserSchema,
 )
-from gotrue.errors import AuthApiError
+from .token import SigningKeyUnavailable, TokenVerificationError, token_expiry
+from gotrue.errors import AuthApiError, AuthError
 
 
 class UserService:
@@ -44,26 +45,33 @@ class UserService:
 
 
 class AuthService:
-    def __init__(
-        self,
-        user_service: UserService,
-    ):
+    """Auth flows over Supabase.
+
+    ``self.supabase`` is the app-wide client and is only used for calls that
+    carry their token explicitly. Flows that establish or use a client-side
+    session (sign in/up, refresh, update) get a client of their own so no
+    session is ever shared between users.
+    """
+
+    def __init__(self, user_service: UserService, container: ServiceContainer):
         self.user_service = user_service
-        self.settings = get_settings()
-        self.supabase = create_client(
-            supabase_key=self.settings.SUPABASE_KEY,
-            supabase_url=self.settings.SUPABASE_URL,
-        )
+        self.container = container
+        self.settings = container.settings
+        self.supabase = container.supabase
+        self.token_verifier = container.token_verifier
+        self.token_cache = container.token_cache
 
     async def sign_in(self, user: UserSignInSchema):
         try:
             user_by_email = await self.user_service.get_user_by_email(user.email)
             print(user_by_email.fullname)
-            response = self.supabase.auth.sign_in_with_password(
-                {
-                    "email": user.email,
-                    "password": user.password,
-                }
+            response = (
+                self.container.create_supabase_client().auth.sign_in_with_password(
+                    {
+                        "email": user.email,
+                        "password": user.password,
+                    }
+                )
             )
             response = SignInResponseSchema(
                 id=response.model_dump().get("user")["id"],
@@ -90,7 +98,7 @@ class AuthService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="User already exists",
                 )
-            response = self.supabase.auth.sign_up(
+            response = self.container.create_supabase_client().auth.sign_up(
                 {
                     "email": new_user.email,
                     "password": new_user.password,
@@ -126,7 +134,7 @@ class AuthService:
         pass
 
     async def update_password(self, password: str):
-        updated_password = self.supabase.auth.update_user(
+        updated_password = self.container.create_supabase_client().auth.update_user(
             {
                 "password": password,
             }
@@ -144,7 +152,10 @@ class AuthService:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST, detail="User not found"
                 )
-            self.supabase.auth.sign_out()
+            self.supabase.auth.admin.sign_out(token, "local")
+            # The signature stays valid until exp; refuse it here until then.
+            self.token_cache.evict(token)
+            self.token_cache.reject(token, until=token_expiry(token))
         except AuthApiError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail=e.message
@@ -169,12 +180,72 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+    async def authenticate(self, token: str) -> TokenUserSchema:
+        """Resolve the user of an access token, verifying it locally unless
+        ``AUTH_VERIFICATION=remote``. Supabase is only asked when no signing
+        key is available and ``AUTH_REMOTE_FALLBACK`` is set. Results are
+        cached per token, rejections briefly."""
+        found, user = self.token_cache.get(token)
+        if not found:
+            user = await self.resolve_token(token)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Not valid credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return user
+
+    async def resolve_token(self, token: str):
+        try:
+            if self.settings.AUTH_VERIFICATION == "remote":
+                user = await self.authenticate_remote(token)
+            else:
+                try:
+                    user = await self.token_verifier.verify(token)
+                except SigningKeyUnavailable as e:
+                    if not self.settings.AUTH_REMOTE_FALLBACK:
+                        # A missing key is our problem, not the token's.
+                        print(e)
+                        return None
+                    user = await self.authenticate_remote(token)
+        except TokenVerificationError as e:
+            print(e)
+            self.token_cache.reject(token)
+            return None
+        self.token_cache.accept(token, user)
+        return user
+
+    async def authenticate_remote(self, token: str) -> TokenUserSchema:
+        """Ask Supabase for the token's user. Only Supabase refusing the token
+        is a rejection; outages surface as 503 so they are never cached."""
+        try:
+            response = self.supabase.auth.get_user(jwt=token)
+        except AuthApiError as e:
+            if e.status < 500 and e.status != 429:
+                raise TokenVerificationError(e.message) from e
+            print(e)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service unavailable",
+            )
+        except AuthError as e:
+            print(e)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service unavailable",
+            )
+        if response is None or response.user is None:
+            raise TokenVerificationError("Token has no user")
+        user = response.user
+        return TokenUserSchema(id=user.id, email=user.email, role=user.role)
+
     async def refresh_session(
         self,
         refresh_token: str,
     ):
         try:
-            response = self.supabase.auth.refresh_session(
+            response = self.container.create_supabase_client().auth.refresh_session(
                 refresh_token,
             )
             if response.user is None:
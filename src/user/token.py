@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional
+import httpx
+from jose import jwk, jwt
+from jose.exceptions import JOSEError
+from src.settings import Settings
+from .schemas import TokenUserSchema
+
+
+class TokenVerificationError(Exception):
+    pass
+
+
+class SigningKeyUnavailable(TokenVerificationError):
+    """Raised when no key can be found for the token, as opposed to the token
+    being invalid; only this case may fall back to the remote check."""
+
+
+class JWKSCache:
+    """Signing keys from a JWKS endpoint, keyed by ``kid``.
+
+    Keys older than ``refresh_seconds`` keep being used while a background
+    task refetches them. An unknown ``kid`` triggers one immediate refetch,
+    at most every ``min_refetch_seconds``, to pick up rotated keys.
+    """
+
+    def __init__(
+        self, url: str, refresh_seconds: float, min_refetch_seconds: float = 30
+    ):
+        self.url = url
+        self.refresh_seconds = refresh_seconds
+        self.min_refetch_seconds = min_refetch_seconds
+        self.keys: dict[str, dict] = {}
+        self.fetched_at = 0.0
+        self.refresh_task: Optional[asyncio.Task] = None
+
+    async def fetch(self) -> None:
+        async with httpx.AsyncClient(timeout=5) as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+        self.keys = {key["kid"]: key for key in response.json()["keys"]}
+        self.fetched_at = time.monotonic()
+
+    async def refresh_in_background(self) -> None:
+        try:
+            await self.fetch()
+        except httpx.HTTPError as e:
+            print(f"JWKS refresh failed: {e}")
+
+    async def get_key(self, kid: str) -> dict:
+        age = time.monotonic() - self.fetched_at
+        if not self.keys or (kid not in self.keys and age >= self.min_refetch_seconds):
+            try:
+                await self.fetch()
+            except httpx.HTTPError as e:
+                raise SigningKeyUnavailable(f"JWKS unavailable: {e}") from e
+        elif age >= self.refresh_seconds and (
+            self.refresh_task is None or self.refresh_task.done()
+        ):
+            self.refresh_task = asyncio.create_task(self.refresh_in_background())
+        if kid not in self.keys:
+            raise SigningKeyUnavailable(f"Unknown signing key {kid!r}")
+        return self.keys[kid]
+
+
+def token_expiry(token: str) -> Optional[float]:
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JOSEError:
+        return None
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+class TokenUserCache:
+    """Bounded LRU from token hash to the user it resolved to.
+
+    Accepted tokens are kept until their ``exp``; rejected ones for
+    ``negative_ttl`` seconds so retries with a bad token stay local. Only a
+    SHA-256 of the token is stored.
+    """
+
+    def __init__(self, maxsize: int, negative_ttl: float):
+        self.maxsize = maxsize
+        self.negative_ttl = negative_ttl
+        self.entries: OrderedDict[str, tuple] = OrderedDict()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> tuple[bool, Optional[TokenUserSchema]]:
+        """Return ``(found, user)``; a found ``None`` user is a rejection."""
+        key = self.key(token)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return False, None
+        self.entries.move_to_end(key)
+        expires_at, user = entry
+        if user is None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return True, user
+
+    def put(self, key: str, expires_at: float, user) -> None:
+        self.entries[key] = (expires_at, user)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def accept(self, token: str, user: TokenUserSchema) -> None:
+        expires_at = user.exp or token_expiry(token)
+        if expires_at is not None and expires_at > time.time():
+            self.put(self.key(token), expires_at, user)
+
+    def reject(self, token: str, until: Optional[float] = None) -> None:
+        self.put(self.key(token), until or time.time() + self.negative_ttl, None)
+
+    def evict(self, token: str) -> None:
+        self.entries.pop(self.key(token), None)
+
+    def snapshot(self) -> dict:
+        return {
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class TokenVerifier:
+    """Verifies access tokens locally: signature, ``exp`` and audience.
+
+    HS* tokens are checked against ``SECRET_KEY`` (the project's JWT secret);
+    asymmetric tokens against the JWKS at ``AUTH_JWKS_URL``.
+    """
+
+    def __init__(self, settings: Settings):
+        self.secret_key = settings.SECRET_KEY
+        self.algorithm = settings.ALGORITHM
+        self.audience = settings.AUTH_AUDIENCE
+        self.jwks = (
+            JWKSCache(settings.AUTH_JWKS_URL, settings.AUTH_JWKS_REFRESH_SECONDS)
+            if settings.AUTH_JWKS_URL
+            else None
+        )
+
+    async def signing_key(self, header: dict):
+        algorithm = header.get("alg")
+        if algorithm and algorithm.startswith("HS"):
+            if algorithm != self.algorithm:
+                raise TokenVerificationError(f"Unexpected algorithm {algorithm}")
+            return self.secret_key, algorithm
+        if self.jwks is None:
+            raise SigningKeyUnavailable(f"No JWKS configured for {algorithm}")
+        key = await self.jwks.get_key(header.get("kid"))
+        if key.get("alg", algorithm) != algorithm:
+            raise TokenVerificationError(f"Unexpected algorithm {algorithm}")
+        try:
+            return jwk.construct(key, algorithm), algorithm
+        except JOSEError as e:
+            raise TokenVerificationError(str(e)) from e
+
+    async def verify(self, token: str) -> TokenUserSchema:
+        try:
+            header = jwt.get_unverified_header(token)
+        except JOSEError as e:
+            raise TokenVerificationError(str(e)) from e
+        key, algorithm = await self.signing_key(header)
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self.audience,
+                options={"verify_aud": self.audience is not None},
+            )
+        except JOSEError as e:
+            raise TokenVerificationError(str(e)) from e
+        if not claims.get("sub"):
+            raise TokenVerificationError("Token has no subject")
+        return TokenUserSchema(
+            id=claims["sub"],
+            email=claims.get("email"),
+            role=claims.get("role"),
+            exp=claims.get("exp"),
+        )